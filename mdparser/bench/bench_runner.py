@@ -1,35 +1,41 @@
 # bench/bench_runner.py
 import time
+from mdparser.markdown_parser.lexer import Lexer
 from mdparser.markdown_parser.parser import Parser
 from mdparser.markdown_parser.renderer import HTMLRenderer
-from mdparser.markdown_parser.cache import CacheManager
-from  mdparser.markdown_parser.monitor import PerformanceMonitor
-import glob
+from mdparser.markdown_parser.cache import CacheManager, LRUCache, NoCache
+from mdparser.markdown_parser.monitor import PerformanceMonitor
 import os
 
+def load_samples(samples_dir: str):
+    # Читаємо всі файли один раз до циклу вимірювання, щоб таймінги
+    # показували лише parse без syscalls/декодування на кожній ітерації.
+    samples = []
+    with os.scandir(samples_dir) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.name.endswith('.md'):
+                with open(entry.path, 'r', encoding='utf-8') as fh:
+                    samples.append((entry.path, fh.read()))
+    return samples
+
 def run_bench(samples_dir: str, cache_enabled: bool=False, iterations: int=1):
-    files = glob.glob(os.path.join(samples_dir, '*.md'))
-    cache = CacheManager(enabled=cache_enabled)
+    samples = load_samples(samples_dir)
+    cache = CacheManager(LRUCache() if cache_enabled else NoCache())
     renderer = HTMLRenderer()
     monitor = PerformanceMonitor()
     times = []
     for it in range(iterations):
-        for f in files:
-            with open(f, 'r', encoding='utf-8') as fh:
-                txt = fh.read()
-            doc = None
-            if cache_enabled:
-                doc = cache.get(txt)
+        for path, txt in samples:
+            doc = cache.get_ast(txt)
             if doc is None:
                 monitor.start_snapshot()
                 t0 = time.time()
-                parser = Parser(txt)
-                doc = parser.parse()
+                tokens = Lexer(txt).tokenize()
+                doc = Parser(tokens, txt).parse()
                 t = time.time() - t0
                 monitor.stop_snapshot()
                 times.append(t)
-                if cache_enabled:
-                    cache.set(txt, doc)
+                cache.set_ast(txt, doc)
             html = renderer.render(doc)
     print("runs:", len(times))
     print("avg:", sum(times)/len(times) if times else 0.0)
@@ -37,4 +43,4 @@ def run_bench(samples_dir: str, cache_enabled: bool=False, iterations: int=1):
     print("monitor agg:", monitor.aggregate())
 
 if __name__ == '__main__':
-    run_bench('../samples', cache_enabled=True, iterations=2)
\ No newline at end of file
+    run_bench('../samples', cache_enabled=True, iterations=2)
@@ -19,13 +19,15 @@ from mdparser.markdown_parser.cache import (
 # Global cache (can be configured via CLI)
 # -------------------------------------------------------------
 
-CACHE_STRATEGIES = {
-    "none": NoCache(),
-    "lru": LRUCache(capacity=256),
-    "lfu": LFUCache(capacity=256)
+# Фабрики замість готових інстансів: створюємо лише обрану стратегію,
+# а не всі три при кожному імпорті модуля.
+CACHE_FACTORIES = {
+    "none": NoCache,
+    "lru": lambda: LRUCache(capacity=256),
+    "lfu": lambda: LFUCache(capacity=256)
 }
 
-cache_manager: CacheManager = CacheManager(CACHE_STRATEGIES["lru"])
+cache_manager: CacheManager = CacheManager(CACHE_FACTORIES["lru"]())
 
 
 # -------------------------------------------------------------
@@ -54,7 +56,7 @@ def parse_markdown(text: str):
     lexer = Lexer(text)
     tokens = lexer.tokenize()
 
-    parser = Parser(tokens)
+    parser = Parser(tokens, text)
     ast = parser.parse()
 
     cache_manager.set_ast(text, ast)
@@ -272,7 +274,7 @@ def main():
         return
 
     # Configure cache strategy
-    cache_manager = CacheManager(CACHE_STRATEGIES[args.cache])
+    cache_manager = CacheManager(CACHE_FACTORIES[args.cache]())
 
     # Run command
     if hasattr(args, "func"):
@@ -1,8 +1,14 @@
 from __future__ import annotations
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 from typing import List, Protocol, Any, Optional, Dict, Callable
 import json
 
+# orjson (C-серіалізатор) — опціональне прискорення для великих AST
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 # -----------------------------------------------------------
 # Visitor Protocol
@@ -28,7 +34,7 @@ class Visitor(Protocol):
 # Base Node Classes
 # -----------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True)
 class Node:
     def accept(self, visitor: Visitor) -> Any:
         raise NotImplementedError("accept not implemented")
@@ -47,17 +53,17 @@ class Node:
 
 # Inline and Block marker classes (for typing)
 class Inline(Node):
-    pass
+    __slots__ = ()
 
 class Block(Node):
-    pass
+    __slots__ = ()
 
 
 # -----------------------------------------------------------
 # Inline Nodes
 # -----------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True)
 class Text(Inline):
     text: str
 
@@ -72,7 +78,7 @@ class Text(Inline):
         return Text(data["text"])
 
 
-@dataclass
+@dataclass(slots=True)
 class CodeSpan(Inline):
     code: str
 
@@ -87,7 +93,7 @@ class CodeSpan(Inline):
         return CodeSpan(data["code"])
 
 
-@dataclass
+@dataclass(slots=True)
 class Bold(Inline):
     children: List[Inline] = field(default_factory=list)
 
@@ -103,7 +109,7 @@ class Bold(Inline):
         return Bold(children)
 
 
-@dataclass
+@dataclass(slots=True)
 class Italic(Inline):
     children: List[Inline] = field(default_factory=list)
 
@@ -119,7 +125,7 @@ class Italic(Inline):
         return Italic(children)
 
 
-@dataclass
+@dataclass(slots=True)
 class Link(Inline):
     text_nodes: List[Inline] = field(default_factory=list)
     url: str = ""
@@ -146,7 +152,7 @@ class Link(Inline):
 # Block Nodes
 # -----------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True)
 class Paragraph(Block):
     inlines: List[Inline] = field(default_factory=list)
 
@@ -162,7 +168,7 @@ class Paragraph(Block):
         return Paragraph(inlines)
 
 
-@dataclass
+@dataclass(slots=True)
 class Heading(Block):
     level: int
     inlines: List[Inline] = field(default_factory=list)
@@ -179,7 +185,7 @@ class Heading(Block):
         return Heading(level=data.get("level", 1), inlines=inlines)
 
 
-@dataclass
+@dataclass(slots=True)
 class CodeBlock(Block):
     code: str
     language: Optional[str] = None
@@ -195,7 +201,7 @@ class CodeBlock(Block):
         return CodeBlock(code=data.get("code", ""), language=data.get("language"))
 
 
-@dataclass
+@dataclass(slots=True)
 class BlockQuote(Block):
     children: List[Block] = field(default_factory=list)
 
@@ -211,7 +217,7 @@ class BlockQuote(Block):
         return BlockQuote(children)
 
 
-@dataclass
+@dataclass(slots=True)
 class ListItem(Block):
     children: List[Block] = field(default_factory=list)
 
@@ -227,7 +233,7 @@ class ListItem(Block):
         return ListItem(children)
 
 
-@dataclass
+@dataclass(slots=True)
 class ListBlock(Block):
     items: List[ListItem] = field(default_factory=list)
     ordered: bool = False
@@ -246,7 +252,7 @@ class ListBlock(Block):
         return ListBlock(items=items, ordered=data.get("ordered", False))
 
 
-@dataclass
+@dataclass(slots=True)
 class HorizontalRule(Block):
     def accept(self, visitor: Visitor) -> Any:
         return visitor.visit_hr(self)
@@ -259,7 +265,7 @@ class HorizontalRule(Block):
         return HorizontalRule()
 
 
-@dataclass
+@dataclass(slots=True)
 class Document(Node):
     blocks: List[Block] = field(default_factory=list)
 
@@ -305,6 +311,119 @@ def _node_from_dict(data: Dict[str, Any]) -> Node:
     return _NODE_TYPE_MAP[t](data)
 
 
+# -----------------------------------------------------------
+# Табличний visitor-диспетч
+# -----------------------------------------------------------
+
+_VISITOR_METHOD: Dict[type, str] = {
+    Text: "visit_text",
+    CodeSpan: "visit_codespan",
+    Bold: "visit_bold",
+    Italic: "visit_italic",
+    Link: "visit_link",
+    Paragraph: "visit_paragraph",
+    Heading: "visit_heading",
+    CodeBlock: "visit_codeblock",
+    BlockQuote: "visit_blockquote",
+    ListItem: "visit_list_item",
+    ListBlock: "visit_list",
+    HorizontalRule: "visit_hr",
+    Document: "visit_document",
+}
+
+
+def visit(node: Node, visitor: Visitor) -> Any:
+    """Еквівалент node.accept(visitor), але без проміжного accept-кадру.
+
+    Обходи (рендеринг) викликають visit-метод напряму за таблицею
+    type → ім'я; невідомі підкласи йдуть через власний accept.
+    """
+    name = _VISITOR_METHOD.get(type(node))
+    if name is None:
+        return node.accept(visitor)
+    return getattr(visitor, name)(node)
+
+
+# -----------------------------------------------------------
+# Iterative serialization (без рекурсії по to_dict)
+# -----------------------------------------------------------
+
+# «Рідні» to_dict кожного класу — щоб відрізнити override у підкласі
+# (тоді віддаємо піддерево його власному to_dict).
+_STOCK_TO_DICT: Dict[type, Any] = {
+    cls: cls.to_dict
+    for cls in (Text, CodeSpan, Bold, Italic, Link, Paragraph, Heading,
+                CodeBlock, BlockQuote, ListItem, ListBlock, HorizontalRule,
+                Document)
+}
+
+
+def node_to_dict(root: Node) -> Dict[str, Any]:
+    """Той самий dict, що й root.to_dict(), але явним стеком.
+
+    Рекурсивний to_dict додає Python-кадр на кожен вузол і падає з
+    RecursionError на глибоких BlockQuote/ListBlock; тут обхід
+    pre-order через work-list, глибина не обмежена.
+    """
+    holder: List[Dict[str, Any]] = []
+    stack = [(root, holder)]
+    while stack:
+        n, sink = stack.pop()
+        cls = type(n)
+        if cls.to_dict is not _STOCK_TO_DICT.get(cls):
+            # Кастомний to_dict — не намагаємось його відтворити
+            sink.append(n.to_dict())
+            continue
+        if cls is Text:
+            sink.append({"type": "Text", "text": n.text})
+            continue
+        if cls is CodeSpan:
+            sink.append({"type": "CodeSpan", "code": n.code})
+            continue
+        if cls is CodeBlock:
+            sink.append({"type": "CodeBlock", "code": n.code, "language": n.language})
+            continue
+        if cls is HorizontalRule:
+            sink.append({"type": "HorizontalRule"})
+            continue
+        # Контейнери: кладемо «оболонку» з порожнім списком дітей,
+        # діти заповнять його при власному pop (reversed зберігає порядок).
+        if cls is Bold:
+            d = {"type": "Bold", "children": []}
+            kids, children = d["children"], n.children
+        elif cls is Italic:
+            d = {"type": "Italic", "children": []}
+            kids, children = d["children"], n.children
+        elif cls is Link:
+            d = {"type": "Link", "text_nodes": [], "url": n.url, "title": n.title}
+            kids, children = d["text_nodes"], n.text_nodes
+        elif cls is Paragraph:
+            d = {"type": "Paragraph", "inlines": []}
+            kids, children = d["inlines"], n.inlines
+        elif cls is Heading:
+            d = {"type": "Heading", "level": n.level, "inlines": []}
+            kids, children = d["inlines"], n.inlines
+        elif cls is BlockQuote:
+            d = {"type": "BlockQuote", "children": []}
+            kids, children = d["children"], n.children
+        elif cls is ListItem:
+            d = {"type": "ListItem", "children": []}
+            kids, children = d["children"], n.children
+        elif cls is ListBlock:
+            d = {"type": "ListBlock", "ordered": n.ordered, "items": []}
+            kids, children = d["items"], n.items
+        elif cls is Document:
+            d = {"type": "Document", "blocks": []}
+            kids, children = d["blocks"], n.blocks
+        else:
+            sink.append(n.to_dict())
+            continue
+        sink.append(d)
+        for child in reversed(children):
+            stack.append((child, kids))
+    return holder[0]
+
+
 # -----------------------------------------------------------
 # Factory helpers (convenience functions)
 # -----------------------------------------------------------
@@ -339,7 +458,13 @@ def mk_list(*items: ListItem, ordered: bool=False) -> ListBlock:
 # -----------------------------------------------------------
 
 def ast_to_json(node: Node, indent: int=2) -> str:
-    return json.dumps(node.to_dict(), ensure_ascii=False, indent=indent)
+    data = node_to_dict(node)
+    # orjson уміє лише відступ у 2 пробіли, тож швидкий шлях — тільки
+    # для indent=2 (значення за замовчуванням); будь-який інший indent
+    # має давати той самий вивід незалежно від наявності orjson.
+    if orjson is not None and indent == 2:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(data, ensure_ascii=False, indent=indent)
 
 
 # -----------------------------------------------------------
@@ -1,5 +1,7 @@
 from __future__ import annotations
-from typing import Dict, Any, Optional, Callable, List, Tuple
+from typing import Dict, Any, Optional, Callable, Tuple
+from collections import OrderedDict
+import os
 import time
 import hashlib
 import threading
@@ -9,9 +11,38 @@ import threading
 # Key generation для кешу
 # -----------------------------------------------------------
 
-def make_key(data: str) -> str:
-    """Уніфікований ключ: SHA256 від даних."""
-    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+# Якщо True — повертаємось до SHA256 (сумісність ключів зі старими кешами).
+# Вмикається і без зміни коду: MDPARSER_SHA256_KEYS=1 в оточенні.
+USE_SHA256_KEYS = os.environ.get("MDPARSER_SHA256_KEYS", "") == "1"
+
+
+def _blake2b_key(data: bytes) -> bytes:
+    # 8 байт достатньо проти випадкових колізій на реалістичних
+    # розмірах кешу (ймовірність ~n²/2⁶⁵), а коротший digest — менше
+    # алокацій і швидше хешування ключа в dict.
+    return hashlib.blake2b(data, digest_size=8).digest()
+
+
+def _sha256_key(data: bytes) -> bytes:
+    return hashlib.sha256(data).digest()
+
+
+_DEFAULT_HASH = _sha256_key if USE_SHA256_KEYS else _blake2b_key
+
+
+def make_key(data, *, _hash: Callable[[bytes], bytes] = _DEFAULT_HASH) -> bytes:
+    """Уніфікований ключ кешу: сирі байти digest від даних.
+
+    Ключ потрібен лише для пошуку в кеші, криптостійкість тут зайва,
+    тому за замовчуванням — швидкий BLAKE2b (8 байт). Алгоритм не є
+    частиною контракту: він підставляється через _hash, тож майбутня
+    заміна (напр. xxhash) не вимагає правок викликачів чи тестів.
+    Приймає і bytes — якщо дані вже закодовані, повторний прохід
+    encode по всьому документу не потрібен. Старий SHA256-шлях
+    доступний через USE_SHA256_KEYS.
+    """
+    encoded = data.encode("utf-8") if isinstance(data, str) else data
+    return _hash(encoded)
 
 
 # -----------------------------------------------------------
@@ -62,45 +93,40 @@ class NoCache(CacheStrategy):
 class LRUCache(CacheStrategy):
     def __init__(self, capacity: int = 128):
         self.capacity = capacity
-        self.cache: Dict[str, Any] = {}
-        self.order: List[str] = []
+        # Звичайний dict замість OrderedDict: з 3.7 він сам зберігає
+        # порядок вставки, тож "переміщення в кінець" — це pop +
+        # повторна вставка, а витіснення LRU — видалення першого ключа
+        # (next(iter(...))). Без двозв'язного списку OrderedDict запис
+        # легший і get/set трохи швидші.
+        self.cache: Dict[Any, Any] = {}
         self.hits = 0
         self.misses = 0
         self.lock = threading.Lock()
 
     def get(self, key: str):
         with self.lock:
-            if key in self.cache:
+            cache = self.cache
+            if key in cache:
                 self.hits += 1
-                # Move to end (most recently used)
-                self.order.remove(key)
-                self.order.append(key)
-                return self.cache[key]
+                value = cache.pop(key)
+                cache[key] = value
+                return value
             self.misses += 1
             return None
 
     def set(self, key: str, value: Any):
         with self.lock:
-            if key in self.cache:
-                # Update + move to end
-                self.order.remove(key)
-                self.order.append(key)
-                self.cache[key] = value
-                return
-
-            # Insert new
-            self.cache[key] = value
-            self.order.append(key)
+            cache = self.cache
+            cache.pop(key, None)
+            cache[key] = value
 
-            # Remove LRU
-            if len(self.cache) > self.capacity:
-                oldest = self.order.pop(0)
-                del self.cache[oldest]
+            # Remove LRU (перший за порядком вставки)
+            if len(cache) > self.capacity:
+                del cache[next(iter(cache))]
 
     def clear(self):
         with self.lock:
             self.cache.clear()
-            self.order.clear()
 
     def stats(self):
         return {
@@ -121,16 +147,32 @@ class LFUCache(CacheStrategy):
     def __init__(self, capacity: int = 128):
         self.capacity = capacity
         self.cache: Dict[str, Tuple[Any, int]] = {}  # key -> (value, freq)
+        # Частотні кошики (класичний O(1) LFU): freq -> ключі в порядку
+        # вставки. Витіснення бере перший ключ із кошика min_freq замість
+        # O(n) min-скану всього словника.
+        self.freq_buckets: Dict[int, "OrderedDict[str, None]"] = {}
+        self.min_freq = 0
         self.hits = 0
         self.misses = 0
         self.lock = threading.Lock()
 
+    def _bump(self, key: str, value: Any, freq: int):
+        # Переносимо ключ із кошика freq у freq+1
+        bucket = self.freq_buckets[freq]
+        del bucket[key]
+        if not bucket:
+            del self.freq_buckets[freq]
+            if self.min_freq == freq:
+                self.min_freq = freq + 1
+        self.freq_buckets.setdefault(freq + 1, OrderedDict())[key] = None
+        self.cache[key] = (value, freq + 1)
+
     def get(self, key: str):
         with self.lock:
             if key in self.cache:
                 self.hits += 1
                 value, freq = self.cache[key]
-                self.cache[key] = (value, freq + 1)
+                self._bump(key, value, freq)
                 return value
             self.misses += 1
             return None
@@ -139,19 +181,26 @@ class LFUCache(CacheStrategy):
         with self.lock:
             if key in self.cache:
                 _, freq = self.cache[key]
-                self.cache[key] = (value, freq + 1)
+                self._bump(key, value, freq)
                 return
 
             if len(self.cache) >= self.capacity:
-                # Remove least-frequent
-                least_key = min(self.cache, key=lambda k: self.cache[k][1])
-                del self.cache[least_key]
+                # Remove least-frequent (найстаріший у кошику min_freq)
+                min_bucket = self.freq_buckets[self.min_freq]
+                victim, _ = min_bucket.popitem(last=False)
+                if not min_bucket:
+                    del self.freq_buckets[self.min_freq]
+                del self.cache[victim]
 
             self.cache[key] = (value, 1)
+            self.freq_buckets.setdefault(1, OrderedDict())[key] = None
+            self.min_freq = 1
 
     def clear(self):
         with self.lock:
             self.cache.clear()
+            self.freq_buckets.clear()
+            self.min_freq = 0
 
     def stats(self):
         return {
@@ -177,9 +226,36 @@ class CacheManager:
     Має одну стратегію (LRU/LFU/NoCache)
     """
 
+    # Скільки рядків тримаємо в id-мемо digest'ів
+    _DIGEST_MEMO_CAP = 256
+
     def __init__(self, strategy: CacheStrategy):
         self.strategy = strategy
         self.enabled = not isinstance(strategy, NoCache)
+        # Мемоізація digest за ідентичністю рядка: сервери й тести часто
+        # повторно подають той самий об'єкт str, і хешувати його вдруге
+        # не потрібно. Ключ — id(text); значення тримає сам рядок, щоб
+        # (а) перевірити ідентичність (id може перевикористатись після
+        # GC) і (б) не дати GC звільнити id, поки запис живий. Обмежений
+        # OrderedDict із LRU-витісненням, як у LRUCache. Під локом,
+        # як і стан стратегій: без нього евікція з іншого потоку може
+        # прибрати щойно знайдений ключ перед move_to_end.
+        self._digest_memo: "OrderedDict[int, Tuple[str, bytes]]" = OrderedDict()
+        self._digest_lock = threading.Lock()
+
+    def _digest(self, text: str) -> bytes:
+        memo = self._digest_memo
+        with self._digest_lock:
+            entry = memo.get(id(text))
+            if entry is not None and entry[0] is text:
+                memo.move_to_end(id(text))
+                return entry[1]
+        digest = make_key(text)
+        with self._digest_lock:
+            memo[id(text)] = (text, digest)
+            if len(memo) > self._DIGEST_MEMO_CAP:
+                memo.popitem(last=False)
+        return digest
 
     # -------------------------------
     # Tokens
@@ -187,12 +263,12 @@ class CacheManager:
     def get_tokens(self, text: str):
         if not self.enabled:
             return None
-        key = "tokens:" + make_key(text)
+        key = b"tokens:" + self._digest(text)
         return self.strategy.get(key)
 
     def set_tokens(self, text: str, tokens: Any):
         if self.enabled:
-            key = "tokens:" + make_key(text)
+            key = b"tokens:" + self._digest(text)
             self.strategy.set(key, tokens)
 
     # -------------------------------
@@ -201,12 +277,12 @@ class CacheManager:
     def get_ast(self, text: str):
         if not self.enabled:
             return None
-        key = "ast:" + make_key(text)
+        key = b"ast:" + self._digest(text)
         return self.strategy.get(key)
 
     def set_ast(self, text: str, ast: Any):
         if self.enabled:
-            key = "ast:" + make_key(text)
+            key = b"ast:" + self._digest(text)
             self.strategy.set(key, ast)
 
     # -------------------------------
@@ -215,14 +291,54 @@ class CacheManager:
     def get_html(self, text: str):
         if not self.enabled:
             return None
-        key = "html:" + make_key(text)
+        key = b"html:" + self._digest(text)
         return self.strategy.get(key)
 
     def set_html(self, text: str, html: str):
         if self.enabled:
-            key = "html:" + make_key(text)
+            key = b"html:" + self._digest(text)
             self.strategy.set(key, html)
 
+    # -------------------------------
+    # AST одним зверненням до кешу
+    # -------------------------------
+    def get_or_compute_ast(self, text: str, parse: Callable[[str], Any]):
+        """AST за один lookup + один store.
+
+        Замість пари get_ast/set_ast у викликача — одна точка входу:
+        на хіті один get, на місі parse і один set. Ключі ті самі, що
+        в get_ast/set_ast, тож шляхи взаємосумісні.
+        """
+        if not self.enabled:
+            return parse(text)
+        key = b"ast:" + self._digest(text)
+        ast = self.strategy.get(key)
+        if ast is None:
+            ast = parse(text)
+            self.strategy.set(key, ast)
+        return ast
+
+    # -------------------------------
+    # Fused parse→render (швидкий шлях)
+    # -------------------------------
+    def render_cached(self, text: str, parse: Callable[[str], Any],
+                      render: Callable[[Any], str]) -> str:
+        """HTML одним зверненням до кешу.
+
+        На хіті — один get по html-ключу замість трьох окремих кешів із
+        проміжними об'єктами; на місі виконується parse→render і
+        зберігається лише фінальний HTML. Ключі ті самі, що в
+        get_html/set_html, тож шляхи взаємосумісні.
+        """
+        if not self.enabled:
+            return render(parse(text))
+        key = b"html:" + self._digest(text)
+        html = self.strategy.get(key)
+        if html is None:
+            html = render(parse(text))
+            self.strategy.set(key, html)
+        return html
+
     # -------------------------------
     # Stats
     # -------------------------------
@@ -277,8 +393,7 @@ class CacheEfficiencyMeter:
 
         for _ in range(repeat):
             start = time.perf_counter()
-            ast = self.parse_func(text)
-            self.render_func(ast)
+            self.cache.render_cached(text, self.parse_func, self.render_func)
             with_cache_times.append(time.perf_counter() - start)
 
         avg_with_cache = sum(with_cache_times) / repeat
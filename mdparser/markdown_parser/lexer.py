@@ -31,13 +31,101 @@ class TokenType(Enum):
 # Token Dataclass
 # -----------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True)
 class Token:
     type: TokenType
     value: str
     position: int
 
 
+# -----------------------------------------------------------
+# Попередньо скомпільовані шаблони для «довгих» токенів.
+# Регекс сканує послідовність на C-рівні замість посимвольного
+# Python-циклу (помітно швидше на великих документах).
+# -----------------------------------------------------------
+
+_SPACE_RE = re.compile(r" +")
+_TEXT_RE = re.compile(r"[^#*\[\]()_\n`\- ]+")
+_NUM_RE = re.compile(r"(\d+)\.?")
+
+# Один майстер-регекс для tokenize(): альтернація з іменованими групами,
+# імена збігаються з TokenType — весь скан іде одним викликом finditer
+# на C-рівні. Порядок гілок важливий (INDENT перед SPACE, DOUBLE_STAR
+# перед STAR, NUMBER/DOT перед TEXT).
+_TOKEN_RE = re.compile(
+    r"(?P<NEWLINE>\n)"
+    r"|(?P<INDENT> {4,})"
+    r"|(?P<SPACE> +)"
+    r"|(?P<DOUBLE_STAR>\*\*)"
+    r"|(?P<HASH>\#)"
+    r"|(?P<DASH>-)"
+    r"|(?P<STAR>\*)"
+    r"|(?P<UNDERSCORE>_)"
+    r"|(?P<BACKTICK>`)"
+    r"|(?P<LBRACKET>\[)"
+    r"|(?P<RBRACKET>\])"
+    r"|(?P<LPAREN>\()"
+    r"|(?P<RPAREN>\))"
+    r"|(?P<NUMBER>\d+\.?)"
+    r"|(?P<DOT>\.)"
+    r"|(?P<TEXT>[^#*\[\]()_\n`\- ]+)"
+)
+
+# Таблиця односимвольних токенів: один dict-lookup замість каскаду if.
+# "*" теж тут — гілка DOUBLE_STAR перевіряється окремо перед видачею STAR.
+_CHAR_TOKENS = {
+    "\n": TokenType.NEWLINE,
+    "#": TokenType.HASH,
+    "-": TokenType.DASH,
+    "*": TokenType.STAR,
+    "_": TokenType.UNDERSCORE,
+    "`": TokenType.BACKTICK,
+    "[": TokenType.LBRACKET,
+    "]": TokenType.RBRACKET,
+    "(": TokenType.LPAREN,
+    ")": TokenType.RPAREN,
+}
+
+# Зворотна таблиця: літеральне значення для кожного «пунктуаційного»
+# типу. Усі HASH-токени ділять один об'єкт "#" тощо — без алокації
+# нового рядка під кожен матч.
+_LITERAL_VALUES = {ttype: ch for ch, ttype in _CHAR_TOKENS.items()}
+_LITERAL_VALUES[TokenType.DOUBLE_STAR] = "**"
+
+
+def _lex_odd_run(text: str, start: int, end: int, append):
+    """Повільний шлях для TEXT-прогону, що починається з цифри поза \\d.
+
+    Відтворює посимвольну логіку next_token у межах прогону: такий
+    прогін містить лише «нетекстові спецсимволи» — цифри та крапки, —
+    тож достатньо гілок NUMBER/DOT/TEXT.
+    """
+    i = start
+    while i < end:
+        ch = text[i]
+        if ch == ".":
+            append(Token(TokenType.DOT, ".", i))
+            i += 1
+        elif ch.isdigit():
+            m = _NUM_RE.match(text, i)
+            if m is not None:
+                append(Token(TokenType.NUMBER, m.group(1), i))
+                i = m.end()
+            else:
+                j = i
+                while j < end and text[j].isdigit():
+                    j += 1
+                value = text[i:j]
+                if j < end and text[j] == ".":
+                    j += 1
+                append(Token(TokenType.NUMBER, value, i))
+                i = j
+        else:
+            # решта прогону — звичайний TEXT (крапки всередині дозволені)
+            append(Token(TokenType.TEXT, text[i:end], i))
+            break
+
+
 # -----------------------------------------------------------
 # Lexer
 # -----------------------------------------------------------
@@ -54,14 +142,41 @@ class Lexer:
     # Основний метод
     # -------------------------------------------------------
     def tokenize(self):
-        tokens = []
-
-        while True:
-            token = self.next_token()
-            tokens.append(token)
-            if token.type == TokenType.EOF:
-                break
+        """Сканує весь текст одним проходом _TOKEN_RE.finditer.
 
+        next_token() лишається для поштучного читання, але тут не
+        викликається: замість Python-циклу по символах увесь скан
+        виконує регекс-рушій, а цикл лише пакує матчі в Token.
+        Позиції відтворюють поведінку next_token: односимвольні токени
+        та ** несуть позицію ПІСЛЯ себе, решта — позицію початку.
+        """
+        text = self.text
+        tokens = []
+        append = tokens.append
+
+        for m in _TOKEN_RE.finditer(text):
+            kind = m.lastgroup
+            if kind == "TEXT":
+                value = m.group()
+                if value[0].isdigit():
+                    # Цифра поза \d (напр. "²") — NUMBER у next_token;
+                    # рідкий шлях, розбираємо цей прогін окремо.
+                    _lex_odd_run(text, m.start(), m.end(), append)
+                else:
+                    append(Token(TokenType.TEXT, value, m.start()))
+            elif kind == "SPACE" or kind == "INDENT":
+                append(Token(TokenType[kind], m.group(), m.start()))
+            elif kind == "NUMBER":
+                # значення — лише цифри, крапка-маркер відкидається
+                append(Token(TokenType.NUMBER, m.group().rstrip("."), m.start()))
+            elif kind == "DOT":
+                append(Token(TokenType.DOT, ".", m.start()))
+            else:
+                ttype = TokenType[kind]
+                append(Token(ttype, _LITERAL_VALUES[ttype], m.end()))
+
+        self.pos = self.length
+        append(Token(TokenType.EOF, "", self.length))
         return tokens
 
     # -------------------------------------------------------
@@ -73,10 +188,14 @@ class Lexer:
 
         ch = self.text[self.pos]
 
-        # --- NEWLINE ---
-        if ch == "\n":
+        # --- Односимвольні токени через таблицю ---
+        ttype = _CHAR_TOKENS.get(ch)
+        if ttype is not None:
+            if ch == "*" and self._peek("**"):
+                self.pos += 2
+                return Token(TokenType.DOUBLE_STAR, "**", self.pos)
             self.pos += 1
-            return Token(TokenType.NEWLINE, "\n", self.pos)
+            return Token(ttype, ch, self.pos)
 
         if ch == ".":
             self.pos += 1
@@ -85,81 +204,34 @@ class Lexer:
         # --- SPACE / INDENT ---
         if ch == " ":
             start = self.pos
-            while self.pos < self.length and self.text[self.pos] == " ":
-                self.pos += 1
-            value = self.text[start:self.pos]
+            m = _SPACE_RE.match(self.text, start)
+            self.pos = m.end()
+            value = m.group()
             if len(value) >= 4:
                 return Token(TokenType.INDENT, value, start)
             return Token(TokenType.SPACE, value, start)
 
-        # --- HASH (#) ---
-        if ch == "#":
-            self.pos += 1
-            return Token(TokenType.HASH, "#", self.pos)
-
-        # --- DASH (-) for list items ---
-        if ch == "-":
-            self.pos += 1
-            return Token(TokenType.DASH, "-", self.pos)
-
-        # --- DOUBLE STAR (**) ---
-        if self._peek("**"):
-            self.pos += 2
-            return Token(TokenType.DOUBLE_STAR, "**", self.pos)
-
-        # --- UNDERSCORE (_) italics ---
-        if ch == "_":
-            self.pos += 1
-            return Token(TokenType.UNDERSCORE, "_", self.pos)
-
-        # --- STAR (*) list item or italics ---
-        if ch == "*":
-            self.pos += 1
-            return Token(TokenType.STAR, "*", self.pos)
-
-        # --- BACKTICK (`) code ---
-        if ch == "`":
-            self.pos += 1
-            return Token(TokenType.BACKTICK, "`", self.pos)
-
-        # --- BRACKETS [ ] ( ) ---
-        if ch == "[":
-            self.pos += 1
-            return Token(TokenType.LBRACKET, "[", self.pos)
-
-        if ch == "]":
-            self.pos += 1
-            return Token(TokenType.RBRACKET, "]", self.pos)
-
-        if ch == "(":
-            self.pos += 1
-            return Token(TokenType.LPAREN, "(", self.pos)
-
-        if ch == ")":
-            self.pos += 1
-            return Token(TokenType.RPAREN, ")", self.pos)
-
-        # --- NUMBER LIST (e.g. "1.") ---
-        # --- NUMBER LIST (e.g. "1.") ---
-        # --- NUMBER (e.g., "1") і DOT (".") для нумерованого списку ---
-        if self.text[self.pos].isdigit():
+        # --- NUMBER (e.g., "1") для нумерованого списку ---
+        # Крапка одразу після числа споживається як частина маркера.
+        if ch.isdigit():
             start = self.pos
+            m = _NUM_RE.match(self.text, start)
+            if m is not None:
+                self.pos = m.end()
+                return Token(TokenType.NUMBER, m.group(1), start)
+            # isdigit() ширший за \d (напр. "²"): повільний запасний шлях
             while self.pos < self.length and self.text[self.pos].isdigit():
                 self.pos += 1
             number_value = self.text[start:self.pos]
-
-            # Перевірка на DOT після числа
             if self.pos < self.length and self.text[self.pos] == ".":
                 self.pos += 1
-                return Token(TokenType.NUMBER, number_value, start)  # спочатку NUMBER
             return Token(TokenType.NUMBER, number_value, start)
 
         # --- TEXT ---
         start = self.pos
-        while self.pos < self.length and self.text[self.pos] not in "#*[]()_\n`- ":
-            self.pos += 1
-        value = self.text[start:self.pos]
-        return Token(TokenType.TEXT, value, start)
+        m = _TEXT_RE.match(self.text, start)
+        self.pos = m.end()
+        return Token(TokenType.TEXT, m.group(), start)
 
     # -------------------------------------------------------
     # Допоміжний метод
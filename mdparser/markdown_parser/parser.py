@@ -1,6 +1,8 @@
 from __future__ import annotations
-from typing import List, Optional, Tuple
-from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+from operator import attrgetter
+import bisect
+import sys
 
 # Імпортуємо лексер і AST-вузли
 from mdparser.markdown_parser.lexer import Token, TokenType, Lexer
@@ -9,6 +11,118 @@ from mdparser.markdown_parser.ast_nodes import (
     ListItem, CodeBlock, CodeSpan, BlockQuote, HorizontalRule, mk_paragraph
 )
 
+# -----------------------------------------------------------
+# Гарячі члени TokenType як модульні константи: у внутрішніх циклах
+# LOAD_GLOBAL + порівняння за ідентичністю (члени enum — синглтони)
+# замість двох атрибутних доступів через метаклас enum на ітерацію.
+# -----------------------------------------------------------
+
+_EOF = TokenType.EOF
+_NEWLINE = TokenType.NEWLINE
+_TEXT = TokenType.TEXT
+_SPACE = TokenType.SPACE
+_HASH = TokenType.HASH
+_DASH = TokenType.DASH
+_NUMBER = TokenType.NUMBER
+_STAR = TokenType.STAR
+_DOUBLE_STAR = TokenType.DOUBLE_STAR
+_BACKTICK = TokenType.BACKTICK
+_LBRACKET = TokenType.LBRACKET
+
+# Символи, що вмикають inline-форматування: якщо жодного немає,
+# рядок гарантовано зведеться до одного Text-вузла.
+_INLINE_SPECIALS = frozenset("*_`[")
+
+# Токени, з яких може починатися блок (frozenset хешує за ідентичністю
+# членів enum — швидше за перебір кортежу в гарячому lookahead).
+_BLOCK_START_TYPES = frozenset((
+    TokenType.HASH, TokenType.DASH, TokenType.NUMBER, TokenType.BACKTICK,
+))
+
+# Стоп-набори спільного циклу _parse_inline_group: для кожного
+# обрамлення — типи, на яких збирання вкладених inline-вузлів
+# зупиняється (EOF перевіряється окремо).
+_BOLD_STOPS = frozenset((TokenType.DOUBLE_STAR, TokenType.NEWLINE))
+_ITALIC_STOPS = {
+    TokenType.STAR: frozenset((TokenType.STAR, TokenType.NEWLINE)),
+    TokenType.UNDERSCORE: frozenset((TokenType.UNDERSCORE, TokenType.NEWLINE)),
+}
+_LINK_STOPS = frozenset((TokenType.RBRACKET,))
+
+# Типи, у яких position вказує ПІСЛЯ токена (конвенція лексера для
+# односимвольних токенів і **); у решти position — початок.
+_END_POSITIONED = frozenset((
+    TokenType.NEWLINE, TokenType.HASH, TokenType.DASH, TokenType.STAR,
+    TokenType.UNDERSCORE, TokenType.BACKTICK, TokenType.LBRACKET,
+    TokenType.RBRACKET, TokenType.LPAREN, TokenType.RPAREN,
+    TokenType.DOUBLE_STAR,
+))
+
+
+# Читач .value для map(): join по зрізу токенів іде повністю на
+# C-рівні, без байткоду генератора на кожен елемент.
+_val = attrgetter("value")
+
+
+def _tok_start(tok: Token) -> int:
+    """Початкова позиція токена в джерельному тексті."""
+    if tok.type in _END_POSITIONED:
+        return tok.position - len(tok.value)
+    return tok.position
+
+
+def _scan_backtick_runs(tokens: List[Token]) -> dict:
+    """Один прохід по токенах: індекс початку кожного бектік-прогону ->
+    довжина прогону.
+
+    Фенси (_is_open_fence, пошук закриття у parse_fenced_codeblock) і
+    закриття codespan
+    перевіряються з parse_block, з lookahead-ів і на кожен токен
+    внутрішніх циклів — без мапи ті самі прогони перескановуються
+    багаторазово. Індекси токенів стабільні, тож мапа будується раз
+    на потік.
+    """
+    runs: dict = {}
+    i = 0
+    n = len(tokens)
+    while i < n:
+        if tokens[i].type is _BACKTICK:
+            j = i + 1
+            while j < n and tokens[j].type is _BACKTICK:
+                j += 1
+            runs[i] = j - i
+            i = j
+        else:
+            i += 1
+    return runs
+
+
+# -----------------------------------------------------------
+# Flyweight для текстових вузлів: у звичайному Markdown ті самі короткі
+# фрагменти (" ", окремі слова) зустрічаються тисячі разів — інтернований
+# рядок дає спільне зберігання і менший AST.
+# -----------------------------------------------------------
+
+_INTERN_MAX_LEN = 32
+
+# Flyweight для найчастіших Text-вузлів: пробіл-роздільник між
+# inline-спанами та порожній рядок трапляються тисячами на прозовому
+# тексті. Вузли ніде не мутуються (text читається як read-only), тож
+# спільний інстанс безпечний і знімає алокацію на кожну появу.
+_SPACE_NODE = Text(" ")
+_EMPTY_NODE = Text("")
+
+
+def _mk_text(value: str) -> Text:
+    if value == " ":
+        return _SPACE_NODE
+    if not value:
+        return _EMPTY_NODE
+    if len(value) < _INTERN_MAX_LEN:
+        value = sys.intern(value)
+    return Text(value)
+
+
 # -----------------------------------------------------------
 # TokenStream - обгортка навколо списку токенів (зручні методи)
 # -----------------------------------------------------------
@@ -16,22 +130,35 @@ from mdparser.markdown_parser.ast_nodes import (
 class ParseError(Exception):
     pass
 
-@dataclass
+# Один спільний EOF-токен на випадок читання за межами списку —
+# без алокації нового Token на кожен peek повз кінець.
+_EOF_TOKEN = Token(TokenType.EOF, "", -1)
+
+
 class TokenStream:
-    tokens: List[Token]
-    pos: int = 0
+    """Обгортка навколо списку токенів (зручні методи).
+
+    peek/next викликаються на кожен токен, тому клас слотований, а
+    довжина списку порахована один раз у конструкторі.
+    """
+    __slots__ = ("tokens", "pos", "n")
+
+    def __init__(self, tokens: List[Token], pos: int = 0):
+        self.tokens = tokens
+        self.pos = pos
+        self.n = len(tokens)
 
     def peek(self) -> Token:
-        if self.pos < len(self.tokens):
+        if self.pos < self.n:
             return self.tokens[self.pos]
-        # Повертаємо EOF-style token
-        return Token(TokenType.EOF, "", self.pos)
+        return _EOF_TOKEN
 
     def next(self) -> Token:
-        tok = self.peek()
-        if self.pos < len(self.tokens):
-            self.pos += 1
-        return tok
+        pos = self.pos
+        if pos < self.n:
+            self.pos = pos + 1
+            return self.tokens[pos]
+        return _EOF_TOKEN
 
     def expect(self, ttype: TokenType) -> Token:
         tok = self.peek()
@@ -43,6 +170,27 @@ class TokenStream:
         tok = self.peek()
         return tok.type in ttypes
 
+    def consume(self, ttype: TokenType) -> bool:
+        """Якщо поточний токен типу ttype — з'їсти його, інакше ні.
+
+        Замінює пару match(X)+next(): один peek і один інкремент
+        замість двох peek-ів на кожному з десятка гарячих місць.
+        """
+        pos = self.pos
+        if pos < self.n and self.tokens[pos].type is ttype:
+            self.pos = pos + 1
+            return True
+        return False
+
+    def skip_while(self, ttype: TokenType) -> None:
+        """З'їсти всі підряд токени типу ttype (порожні рядки тощо)."""
+        pos = self.pos
+        toks = self.tokens
+        n = self.n
+        while pos < n and toks[pos].type is ttype:
+            pos += 1
+        self.pos = pos
+
     def eof(self) -> bool:
         return self.peek().type == TokenType.EOF
 
@@ -55,115 +203,215 @@ class Parser:
     """
     Recursive-descent parser for a subset of Markdown.
     """
+    # Без __dict__: атрибути парсера читаються в кожному циклі, слоти
+    # роблять доступ дешевшим і фіксують набір полів.
+    __slots__ = ("tokens", "_src", "_bt_run_at", "_bt_run_starts", "_inline_memo",
+                 "_line_start", "_is_bq", "_block_dispatch", "_inline_dispatch",
+                 "_link_dispatch")
 
-    def __init__(self, tokens: list[Token]):
+    def __init__(self, tokens: Sequence[Token], text: Optional[str] = None):
         """
-        Ініціалізація парсера зі списком токенів.
+        Ініціалізація парсера з послідовністю токенів.
+
+        text — необов'язкове джерело, з якого лексер отримав токени:
+        з ним код у fenced-блоках/codespan вирізається одним зрізом
+        замість поштучного збирання значень.
         """
-        if not isinstance(tokens, list) or not all(isinstance(t, Token) for t in tokens):
-            raise TypeError(f"Parser expects list of Tokens, got {type(tokens)}")
+        # Вибіркова перевірка замість повного O(N) isinstance-проходу на
+        # кожен парс; python -O прибирає її зовсім. Кортежі та інші
+        # послідовності теж приймаються.
+        if __debug__ and len(tokens) and not isinstance(tokens[0], Token):
+            raise TypeError(f"Parser expects a sequence of Tokens, got {type(tokens[0])}")
         self.tokens = TokenStream(tokens)
+        self._src = text
+        self._bt_run_at = _scan_backtick_runs(tokens)
+        # Старти прогонів у зростанні (dict зберігає порядок вставки) —
+        # для bisect-пошуку закривального фенса.
+        self._bt_run_starts = list(self._bt_run_at)
+        # Мемо inline-діапазонів: (start_pos, stop_type) -> (end_pos, nodes)
+        self._inline_memo: dict = {}
+        # Індекси токенів, з яких починається кожен логічний рядок:
+        # дозволяє рядковим конструкціям (blockquote) стрибати одразу в
+        # кінець рядка замість покрокового циклу до NEWLINE.
+        # ... та індекси TEXT-токенів, що починаються з '>': один
+        # startswith на токен при ініціалізації замість одного на кожну
+        # з кількох перевірок блокового диспетчу.
+        line_start = [0]
+        is_bq = set()
+        _append = line_start.append
+        _bq_add = is_bq.add
+        for i, t in enumerate(tokens):
+            tt = t.type
+            if tt is _NEWLINE:
+                _append(i + 1)
+            elif tt is _TEXT and t.value.startswith(">"):
+                _bq_add(i)
+        self._line_start = line_start
+        self._is_bq = is_bq
+        # Диспетч блоків за стартовим токеном: один dict-lookup замість
+        # каскаду перевірок у parse_block (той самий прийом, що
+        # _CHAR_TOKENS у лексері).
+        self._block_dispatch = {
+            TokenType.HASH: self.parse_heading,
+            TokenType.BACKTICK: self._block_backtick,
+            TokenType.TEXT: self._block_text,
+            TokenType.DASH: self._block_dash,
+            TokenType.STAR: self._block_star,
+            TokenType.NUMBER: self.parse_list,
+        }
+        self._inline_dispatch = {
+            TokenType.DOUBLE_STAR: self.parse_bold,
+            TokenType.STAR: self.parse_italic,
+            TokenType.UNDERSCORE: self.parse_italic,
+            TokenType.LBRACKET: self.parse_link,
+        }
+        # Таблиця вкладеного форматування всередині посилання (bold і
+        # italic всередині один одного йдуть через стек _parse_emphasis).
+        self._link_dispatch = {
+            TokenType.DOUBLE_STAR: self.parse_bold,
+            TokenType.STAR: self.parse_italic,
+            TokenType.UNDERSCORE: self.parse_italic,
+            TokenType.BACKTICK: self.parse_codespan,
+        }
 
     def _is_hr_line(self) -> bool:
         """
         Перевіряє, чи поточна лінія — горизонтальна лінія (--- або ***).
+
+        Чисте заглядання вперед по списку токенів: позиція не рухається
+        і не відкочується, споживає лінію сам parse_block.
         """
+        toks = self.tokens.tokens
+        pos = self.tokens.pos
+        n = self.tokens.n
         count_dash = 0
         count_star = 0
-        pos = self.tokens.pos
-        while not self.tokens.eof() and self.tokens.peek().type in (TokenType.DASH, TokenType.STAR):
-            tok = self.tokens.next()
-            if tok.type == TokenType.DASH:
+        while pos < n:
+            tt = toks[pos].type
+            if tt is TokenType.DASH:
                 count_dash += 1
-            elif tok.type == TokenType.STAR:
+            elif tt is TokenType.STAR:
                 count_star += 1
+            else:
+                break
+            pos += 1
 
         # HR мінімум 3 символи одного типу
-        if count_dash >= 3 or count_star >= 3:
-            return True
-        self.tokens.pos = pos  # відкотимо позицію, якщо це не HR
-        return False
+        return count_dash >= 3 or count_star >= 3
     # -------------------------------------------------------
     # Верхній рівень: parse whole document
     # -------------------------------------------------------
     def parse(self) -> Document:
         blocks: List = []
         # Skip leading newlines
-        while self.tokens.match(TokenType.NEWLINE):
-            self.tokens.next()
+        self.tokens.skip_while(TokenType.NEWLINE)
         while not self.tokens.eof():
             block = self.parse_block()
             if block is not None:
                 blocks.append(block)
             # skip trailing newlines between blocks
-            while self.tokens.match(TokenType.NEWLINE):
-                self.tokens.next()
+            self.tokens.skip_while(TokenType.NEWLINE)
         return Document(blocks=blocks)
 
+    def iter_blocks(self):
+        """Генератор блоків без матеріалізації Document.
+
+        Той самий цикл, що в parse(), але блоки віддаються по одному:
+        споживач (напр. потоковий рендер) може обробити блок і відпустити
+        його до розбору наступного, тож живим лишається один блок AST
+        замість цілого дерева документа.
+        """
+        self.tokens.skip_while(TokenType.NEWLINE)
+        while not self.tokens.eof():
+            block = self.parse_block()
+            if block is not None:
+                yield block
+            self.tokens.skip_while(TokenType.NEWLINE)
+
     # -------------------------------------------------------
     # Parse a block-level element
     # -------------------------------------------------------
     def parse_block(self):
-        tok = self.tokens.peek()
+        handler = self._block_dispatch.get(self.tokens.peek().type)
+        if handler is not None:
+            return handler()
+        # Otherwise paragraph (one or more lines merged)
+        return self.parse_paragraph()
 
-        # Heading: starts with HASH (one or multiple)
-        if tok.type == TokenType.HASH:
-            return self.parse_heading()
-
-        # Fenced code block: triple backtick represented as BACKTICK repeated?
-        # Our lexer returns BACKTICK for single backtick; fenced code detection relies on text pattern in lexer
-        # For simplicity, treat a line starting with three backticks as start of codeblock:
-        if tok.type == TokenType.BACKTICK:
-            # Check if there are multiple backticks contiguous (lexer returns one backtick token per `)
-            # If next two tokens are also BACKTICK, assume fence
-            if self._is_open_fence():
-                return self.parse_fenced_codeblock()
-            # else fallthrough to paragraph (inline code)
-
-        # Blockquote: leading '>' - we used 'DASH' for -, but blockquote is not tokenized specially in lexer.
-        # To keep backward compatibility, detect lines starting with '>' in TEXT via the value.
-        if tok.type == TokenType.TEXT and tok.value.startswith('>'):
+    # --- обробники за стартовим токеном ---
+
+    def _block_backtick(self):
+        # Fenced code block: triple backtick represented as BACKTICK repeated
+        # (lexer returns one BACKTICK token per `); single backtick — inline
+        # code, тож рядок іде як параграф.
+        if self._is_open_fence():
+            return self.parse_fenced_codeblock()
+        return self.parse_paragraph()
+
+    def _block_text(self):
+        # Blockquote is not tokenized specially in lexer: detect lines
+        # starting with '>' via the precomputed index set.
+        if self.tokens.pos in self._is_bq:
             return self.parse_blockquote()
+        return self.parse_paragraph()
 
-        # Horizontal rule: a line starting with three or more '-' or '*' may be tokenized as multiple DASH/STAR tokens.
+    def _block_dash(self):
+        # '-' — або горизонтальна лінія (---), або маркер списку
         if self._is_hr_line():
-            # consume until newline
-            while not self.tokens.eof() and not self.tokens.match(TokenType.NEWLINE):
-                self.tokens.next()
-            # consume newline if present
-            if self.tokens.match(TokenType.NEWLINE):
-                self.tokens.next()
-            return HorizontalRule()
+            return self._consume_hr()
+        return self.parse_list()
 
-        # List items: '-' or NUMBER + '.' as NUMBER token
-        if tok.type == TokenType.DASH or tok.type == TokenType.NUMBER:
-            return self.parse_list()
-
-        # Otherwise paragraph (one or more lines merged)
+    def _block_star(self):
+        # '*' — або горизонтальна лінія (***), або курсив у параграфі
+        if self._is_hr_line():
+            return self._consume_hr()
         return self.parse_paragraph()
 
+    def _consume_hr(self) -> HorizontalRule:
+        # consume until newline (локальні toks/pos без peek-викликів)
+        tokens = self.tokens
+        toks = tokens.tokens
+        pos = tokens.pos
+        n = tokens.n
+        while pos < n:
+            tt = toks[pos].type
+            if tt is _NEWLINE or tt is _EOF:
+                break
+            pos += 1
+        tokens.pos = pos
+        # consume newline if present
+        tokens.consume(TokenType.NEWLINE)
+        return HorizontalRule()
+
     # -------------------------------------------------------
     # Parse heading
     # "#" repeated one or more times at beginning of line
     # -------------------------------------------------------
     def parse_heading(self) -> Heading:
         # Count continuous HASH tokens at start of line
+        tokens = self.tokens
         level = 0
-        while self.tokens.match(TokenType.HASH):
-            self.tokens.next()
+        while tokens.peek().type is _HASH:
+            tokens.pos += 1
             level += 1
         # optional spaces
-        if self.tokens.match(TokenType.SPACE):
-            self.tokens.next()
+        tokens.consume(TokenType.SPACE)
         # rest of line as inline content
         # IMPORTANT: Heading treats all TEXT literally, ignore `_` for italic
         inlines: List = []
-        while not self.tokens.eof() and not self.tokens.match(TokenType.NEWLINE):
-            tok = self.tokens.next()
+        toks = tokens.tokens
+        pos = tokens.pos
+        n = tokens.n
+        while pos < n:
+            tok = toks[pos]
+            tt = tok.type
+            if tt is _NEWLINE or tt is _EOF:
+                break
             inlines.append(Text(tok.value))
+            pos += 1
+        tokens.pos = pos
         # consume newline if present
-        if self.tokens.match(TokenType.NEWLINE):
-            self.tokens.next()
+        tokens.consume(TokenType.NEWLINE)
         return Heading(level=level, inlines=inlines)
 
     # -------------------------------------------------------
@@ -171,58 +419,60 @@ class Parser:
     # We detect three consecutive BACKTICK tokens as fence open.
     # -------------------------------------------------------
     def _is_open_fence(self) -> bool:
-        # Ensure at least 3 backtick tokens in a row before newline
-        pos = self.tokens.pos
-        count = 0
-        while pos < len(self.tokens.tokens) and self.tokens.tokens[pos].type == TokenType.BACKTICK:
-            count += 1
-            pos += 1
-        return count >= 3
+        # Ensure at least 3 backtick tokens in a row: O(1) у попередньо
+        # зібраній мапі замість повторного сканування прогону.
+        return self._bt_run_at.get(self.tokens.pos, 0) >= 3
 
     def parse_fenced_codeblock(self) -> CodeBlock:
         # consume fence (count backticks)
         fence_count = 0
-        while self.tokens.match(TokenType.BACKTICK):
-            self.tokens.next()
+        while self.tokens.peek().type is _BACKTICK:
+            self.tokens.pos += 1
             fence_count += 1
-        # optional language identifier as TEXT tokens until NEWLINE
-        lang_parts = []
-        while not self.tokens.eof() and not self.tokens.match(TokenType.NEWLINE):
-            t = self.tokens.next()
-            if t.type == TokenType.TEXT or t.type == TokenType.SPACE:
-                lang_parts.append(t.value)
-            else:
-                lang_parts.append(t.value)
-        lang = ''.join(lang_parts).strip() or None
+        # optional language identifier: решта рядка одним зрізом+join
+        # замість циклу next()/append по токену
+        pos = self.tokens.pos
+        ls = self._line_start
+        k = bisect.bisect_right(ls, pos)
+        line_end = ls[k] - 1 if k < len(ls) else self.tokens.n - 1
+        lang = ''.join(map(_val, self.tokens.tokens[pos:line_end])).strip() or None
+        self.tokens.pos = line_end
         # consume newline
-        if self.tokens.match(TokenType.NEWLINE):
-            self.tokens.next()
-        # collect code lines until we find closing fence of same length
-        code_parts: List[str] = []
-        while not self.tokens.eof():
-            # check for potential closing fence
-            if self._is_close_fence(fence_count):
-                # consume fence tokens
-                for _ in range(fence_count):
-                    self.tokens.next()
-                # swallow rest of line until newline
-                while not self.tokens.eof() and not self.tokens.match(TokenType.NEWLINE):
-                    self.tokens.next()
-                if self.tokens.match(TokenType.NEWLINE):
-                    self.tokens.next()
+        self.tokens.consume(TokenType.NEWLINE)
+        # закривальний фенс шукаємо напряму в відсортованих стартах
+        # бектік-прогонів (bisect) замість покрокового циклу по токенах
+        pos = self.tokens.pos
+        starts = self._bt_run_starts
+        runs = self._bt_run_at
+        close = -1
+        k = bisect.bisect_left(starts, pos)
+        while k < len(starts):
+            i = starts[k]
+            if runs[i] >= fence_count:
+                close = i
                 break
-            # otherwise collect raw token values respecting newlines
-            t = self.tokens.next()
-            code_parts.append(t.value)
-        code_text = ''.join(code_parts)
+            k += 1
+        toks = self.tokens.tokens
+        end = close if close >= 0 else self.tokens.n - 1
+        src = self._src
+        if src is not None and end > pos:
+            first = toks[pos]
+            last = toks[end - 1]
+            code_text = src[_tok_start(first):_tok_start(last) + len(last.value)]
+        else:
+            code_text = ''.join(map(_val, toks[pos:end]))
+        self.tokens.pos = end
+        if close >= 0:
+            # consume fence tokens, then swallow rest of line until newline
+            self.tokens.pos = close + fence_count
+            while not self.tokens.eof() and not self.tokens.match(TokenType.NEWLINE):
+                self.tokens.next()
+            self.tokens.consume(TokenType.NEWLINE)
         return CodeBlock(code=code_text, language=lang)
 
     def _is_close_fence(self, fence_count: int) -> bool:
-        pos = self.tokens.pos
-        for i in range(fence_count):
-            if pos + i >= len(self.tokens.tokens) or self.tokens.tokens[pos + i].type != TokenType.BACKTICK:
-                return False
-        return True
+        # >= зберігає стару семантику: довший прогін теж закриває фенс
+        return self._bt_run_at.get(self.tokens.pos, 0) >= fence_count
 
     # -------------------------------------------------------
     # Parse blockquote lines starting with '>' at beginning of line.
@@ -233,42 +483,41 @@ class Parser:
 
         while not self.tokens.eof():
 
-            tok = self.tokens.peek()
-
-            if tok.type == TokenType.TEXT and tok.value.startswith(">"):
+            if self.tokens.pos in self._is_bq:
                 self.tokens.next()
 
-                if self.tokens.match(TokenType.SPACE):
-                    self.tokens.next()
-
-                # collect line until newline
-                line_parts = []
-                while not self.tokens.eof() and not self.tokens.match(TokenType.NEWLINE):
-                    part = self.tokens.next()
-                    if part.type == TokenType.TEXT:
-                        line_parts.append(part.value)
-                    else:
-                        line_parts.append(part.value)
-
-                line = "".join(line_parts)
+                self.tokens.consume(TokenType.SPACE)
+
+                # кінець рядка з таблиці _line_start: позиція стрибає на
+                # NEWLINE (чи EOF) без покрокового next()-циклу
+                pos = self.tokens.pos
+                ls = self._line_start
+                k = bisect.bisect_right(ls, pos)
+                line_end = ls[k] - 1 if k < len(ls) else self.tokens.n - 1
+
+                # Рядок збираємо зі значень токенів, як параграфи й
+                # заголовки: зріз джерела зберігав би крапку після
+                # NUMBER лише на швидкому шляху, і та сама цитата
+                # рендерилась би по-різному залежно від наявності
+                # inline-розмітки в ній.
+                line = "".join(map(_val, self.tokens.tokens[pos:line_end]))
+                self.tokens.pos = line_end
                 buffer_lines.append(line)
 
                 # consume newline if any
-                if self.tokens.match(TokenType.NEWLINE):
-                    self.tokens.next()
+                self.tokens.consume(TokenType.NEWLINE)
 
                 continue
 
             # Case 2: TEXT token starting with '>'
-            if tok.type == TokenType.TEXT and tok.value.startswith(">"):
+            if self.tokens.pos in self._is_bq:
                 raw = self.tokens.next().value
                 line = raw[1:]
                 if line.startswith(" "):
                     line = line[1:]
                 buffer_lines.append(line)
 
-                if self.tokens.match(TokenType.NEWLINE):
-                    self.tokens.next()
+                self.tokens.consume(TokenType.NEWLINE)
                 continue
 
             break
@@ -280,10 +529,33 @@ class Parser:
         # join lines with \n as tests expect
         paragraph_text = "\n".join(buffer_lines)
 
-        # parse inline content
+        # Швидкий шлях: без inline-спецсимволів цитата — один Text-вузол,
+        # повторний прохід лексера по вже прочитаному тексту не потрібен.
+        if _INLINE_SPECIALS.isdisjoint(paragraph_text):
+            return BlockQuote(children=[Paragraph(inlines=[_mk_text(paragraph_text)])])
+
+        # parse inline content: перевикористовуємо цей самий Parser,
+        # тимчасово підмінивши потік токенів
         inline_tokens = Lexer(paragraph_text).tokenize()
-        inline_parser = Parser(inline_tokens)
-        inlines = inline_parser.parse_inline_until(TokenType.EOF)
+        saved_stream = self.tokens
+        saved_src = self._src
+        saved_runs = self._bt_run_at
+        saved_run_starts = self._bt_run_starts
+        saved_memo = self._inline_memo
+        self.tokens = TokenStream(inline_tokens)
+        # токени тепер адресують paragraph_text, не вихідний документ
+        self._src = paragraph_text
+        self._bt_run_at = _scan_backtick_runs(inline_tokens)
+        self._bt_run_starts = list(self._bt_run_at)
+        self._inline_memo = {}
+        try:
+            inlines = self.parse_inline_until(TokenType.EOF)
+        finally:
+            self.tokens = saved_stream
+            self._src = saved_src
+            self._bt_run_at = saved_runs
+            self._bt_run_starts = saved_run_starts
+            self._inline_memo = saved_memo
 
         return BlockQuote(children=[Paragraph(inlines=inlines)])
 
@@ -295,14 +567,17 @@ class Parser:
     # -------------------------------------------------------
     def parse_list(self) -> ListBlock:
         items = []
-        ordered = self.tokens.peek().type == TokenType.NUMBER
+        tokens = self.tokens
+        ordered = tokens.peek().type is _NUMBER
 
-        while not self.tokens.eof() and (self.tokens.match(TokenType.DASH) or self.tokens.match(TokenType.NUMBER)):
-            marker = self.tokens.next()  # споживаємо маркер списку (- або число)
+        while True:
+            tt = tokens.peek().type
+            if tt is not _DASH and tt is not _NUMBER:
+                break
+            tokens.pos += 1  # споживаємо маркер списку (- або число)
 
             # Пропускаємо пробіл після маркера
-            if self.tokens.match(TokenType.SPACE):
-                self.tokens.next()
+            tokens.consume(TokenType.SPACE)
 
             # Парсимо рядок як inlines до кінця рядка
             inlines: List = self.parse_inline_until(TokenType.NEWLINE)
@@ -311,8 +586,7 @@ class Parser:
             items.append(ListItem(children=[paragraph]))
 
             # Пропускаємо newline після елемента
-            if self.tokens.match(TokenType.NEWLINE):
-                self.tokens.next()
+            tokens.consume(TokenType.NEWLINE)
 
         return ListBlock(items=items, ordered=ordered)
 
@@ -320,28 +594,38 @@ class Parser:
     # Parse paragraph: one or more lines joined until blank line or block-start token.
     # -------------------------------------------------------
     def parse_paragraph(self) -> Paragraph:
+        # Суміжний простий текст накопичується в буфері й зливається в
+        # один Text-вузол при зустрічі форматованого inline (або в кінці):
+        # менше крихітних вузлів, соft break — це " " у буфері, а не
+        # окремий Text(" ").
         inlines: List = []
-        first = True
+        buf: List[str] = []
         while not self.tokens.eof():
             # stop when next block-start token encountered at line start
             if self._is_block_start_lookahead():
                 break
             # parse inline content until newline
-            part = self.parse_inline_until(TokenType.NEWLINE)
-            inlines.extend(part)
+            for node in self.parse_inline_until(TokenType.NEWLINE):
+                if type(node) is Text:
+                    buf.append(node.text)
+                else:
+                    if buf:
+                        inlines.append(_mk_text("".join(buf)))
+                        buf.clear()
+                    inlines.append(node)
             # if newline present, consume it and check for blank line (paragraph boundary)
-            if self.tokens.match(TokenType.NEWLINE):
-                # consume one newline
-                self.tokens.next()
+            if self.tokens.consume(TokenType.NEWLINE):
                 # if next token is also NEWLINE -> paragraph end (we'll consume in outer loop)
                 if self.tokens.match(TokenType.NEWLINE):
                     # don't consume second here; outer parse() consumes continuous newlines
                     break
-                # else continue: soft line break => insert space
-                inlines.append(Text(" "))
+                # else continue: soft line break => space into buffer
+                buf.append(" ")
                 continue
             else:
                 break
+        if buf:
+            inlines.append(_mk_text("".join(buf)))
         return Paragraph(inlines=inlines)
 
     def _is_block_start_lookahead(self) -> bool:
@@ -350,17 +634,17 @@ class Parser:
         decide paragraph termination when encountering tokens like HASH, DASH, NUMBER, BACKTICK fences, etc.
         """
         tok = self.tokens.peek()
-        if tok.type in (TokenType.HASH, TokenType.DASH, TokenType.NUMBER, TokenType.BACKTICK):
+        ttype = tok.type
+        if ttype in _BLOCK_START_TYPES:
             # If BACKTICK is fence (>=3), treat as block start
-            if tok.type == TokenType.BACKTICK:
+            if ttype is _BACKTICK:
                 return self._is_open_fence()
             return True
-        # Additionally, if TEXT token begins with '>' treat as blockquote
-        if tok.type == TokenType.TEXT and tok.value.startswith('>'):
-            return True
-        # horizontal rule: sequence of '-' or '*' tokens at line start; we approximate by looking at text
-        if tok.type == TokenType.TEXT and tok.value.strip().startswith('---'):
-            return True
+        # Additionally, if TEXT token begins with '>' treat as blockquote;
+        # horizontal rule approximated by looking at text
+        if ttype is _TEXT:
+            return (self.tokens.pos in self._is_bq
+                    or tok.value.strip().startswith('---'))
         return False
 
     # -------------------------------------------------------
@@ -369,92 +653,142 @@ class Parser:
     # Supports nested inline constructs.
     # -------------------------------------------------------
     def parse_inline_until(self, stop_token_type: TokenType) -> List:
+        # Вибіркова packrat-мемоізація: той самий діапазон із тією самою
+        # стоп-умовою парситься детерміновано, тож повторний вхід (шляхи
+        # перегляду в bold/italic) віддає кеш і стрибає на кінець.
+        tokens = self.tokens
+        memo_key = (tokens.pos, stop_token_type)
+        cached = self._inline_memo.get(memo_key)
+        if cached is not None:
+            tokens.pos = cached[0]
+            return list(cached[1])
         nodes: List = []
-        while not self.tokens.eof() and not self.tokens.match(stop_token_type):
-            tok = self.tokens.peek()
-            if tok.type == TokenType.DOUBLE_STAR:
-                nodes.append(self.parse_bold())
-                continue
-            if tok.type == TokenType.STAR:
-                # could be list marker or italic depending on context; here we treat as italic if inline
-                # if star at start of line and followed by space => list; but this function is called after handling lists
-                nodes.append(self.parse_italic())
-                continue
-            if tok.type == TokenType.UNDERSCORE:
-                nodes.append(self.parse_italic())
+        inline_dispatch = self._inline_dispatch
+        while True:
+            ttype = tokens.peek().type
+            if ttype is _EOF or ttype is stop_token_type:
+                break
+            # DOUBLE_STAR/STAR/UNDERSCORE/LBRACKET — через таблицю
+            # (STAR тут курсив: списки вже оброблені на рівні блоків)
+            handler = inline_dispatch.get(ttype)
+            if handler is not None:
+                nodes.append(handler())
                 continue
-            if tok.type == TokenType.BACKTICK:
+            if ttype is _BACKTICK:
                 # if three backticks => should be fence handled at block-level, so here it's codespan
                 if self._is_open_fence():
                     # if we encounter a fence within paragraph (rare), break to let block parser handle
                     break
                 nodes.append(self.parse_codespan())
                 continue
-            if tok.type == TokenType.LBRACKET:
-                nodes.append(self.parse_link())
-                continue
-            if tok.type == TokenType.TEXT:
-                nodes.append(Text(self.tokens.next().value))
-                continue
-            if tok.type == TokenType.SPACE:
-                # preserve spaces as Text nodes (parser merges them)
-                nodes.append(Text(self.tokens.next().value))
+            if ttype is _TEXT or ttype is _SPACE:
+                # Прогін звичайного тексту: TEXT/SPACE-токени йдуть
+                # підряд десятками — збираємо їх одним внутрішнім циклом
+                # без перевірок inline-форматування і віддаємо один
+                # Text-вузол замість вузла на кожен токен.
+                toks = tokens.tokens
+                pos = tokens.pos
+                n = tokens.n
+                start = pos
+                while pos < n:
+                    tt = toks[pos].type
+                    if tt is stop_token_type or (
+                            tt is not _TEXT and tt is not _SPACE):
+                        break
+                    pos += 1
+                self.tokens.pos = pos
+                if pos - start == 1:
+                    nodes.append(_mk_text(toks[start].value))
+                else:
+                    nodes.append(_mk_text("".join(map(_val, toks[start:pos]))))
                 continue
             # fallback: consume token as text
-            nodes.append(Text(self.tokens.next().value))
+            nodes.append(_mk_text(self.tokens.next().value))
+        # Діапазони <= 2 токенів не запам'ятовуємо: накладні витрати
+        # словника більші за повторний парс.
+        if tokens.pos - memo_key[0] > 2:
+            self._inline_memo[memo_key] = (tokens.pos, nodes)
         return nodes
 
+    # -------------------------------------------------------
+    # Узагальнений цикл збирання inline-вузлів до стоп-типу з таблицею
+    # вкладеного форматування (використовується parse_link; емфаза йде
+    # через явний стек у _parse_emphasis нижче).
+    # -------------------------------------------------------
+    def _parse_inline_group(self, stop_types: frozenset, dispatch: dict) -> List:
+        children: List = []
+        tokens = self.tokens
+        while True:
+            tt = tokens.peek().type
+            if tt is _EOF or tt in stop_types:
+                break
+            handler = dispatch.get(tt)
+            if handler is not None:
+                children.append(handler())
+            else:
+                children.append(_mk_text(tokens.next().value))
+        return children
+
+    # -------------------------------------------------------
+    # Вкладені **/*/_ ітеративно: ланцюжок **_*...*_** рекурсував
+    # bold→italic→bold з повним Python-кадром на рівень; явний стек
+    # кадрів [клас, закривач, стопи, діти] обробляє їх одним циклом.
+    # Посилання й codespan не рекурсують через емфазу, тож лишаються
+    # прямими викликами.
+    # -------------------------------------------------------
+    def _parse_emphasis(self, opener_type: TokenType):
+        tokens = self.tokens
+        if opener_type is _DOUBLE_STAR:
+            stack = [[Bold, _DOUBLE_STAR, _BOLD_STOPS, []]]
+        else:
+            stack = [[Italic, opener_type, _ITALIC_STOPS[opener_type], []]]
+        while True:
+            cls, op, stops, children = stack[-1]
+            tt = tokens.peek().type
+            if tt is _EOF or tt in stops:
+                # закриваємо кадр; маркер з'їдаємо, якщо він і зупинив
+                if tt is op:
+                    tokens.next()
+                node = cls(children=children)
+                stack.pop()
+                if not stack:
+                    return node
+                stack[-1][3].append(node)
+                continue
+            if cls is Bold and tt is _STAR:
+                tokens.next()
+                stack.append([Italic, _STAR, _ITALIC_STOPS[_STAR], []])
+                continue
+            if cls is Italic and tt is _DOUBLE_STAR:
+                tokens.next()
+                stack.append([Bold, _DOUBLE_STAR, _BOLD_STOPS, []])
+                continue
+            if tt is _LBRACKET:
+                children.append(self.parse_link())
+                continue
+            if tt is _BACKTICK:
+                children.append(self.parse_codespan())
+                continue
+            children.append(_mk_text(tokens.next().value))
+
     # -------------------------------------------------------
     # parse bold: **...**, lexer emits DOUBLE_STAR token for '**'
     # -------------------------------------------------------
     def parse_bold(self) -> Bold:
         # consume opening **
-        if not self.tokens.match(TokenType.DOUBLE_STAR):
+        if not self.tokens.consume(TokenType.DOUBLE_STAR):
             # defensive: if there's single STAR but we expected bold, fallback
             self.tokens.next()
             return Bold(children=[Text("")])
-        self.tokens.next()
-        children: List = []
-        while not self.tokens.eof() and not self.tokens.match(TokenType.DOUBLE_STAR) and not self.tokens.match(TokenType.NEWLINE):
-            if self.tokens.match(TokenType.STAR):
-                children.append(self.parse_italic())
-            elif self.tokens.match(TokenType.LBRACKET):
-                children.append(self.parse_link())
-            elif self.tokens.match(TokenType.BACKTICK):
-                children.append(self.parse_codespan())
-            elif self.tokens.match(TokenType.TEXT) or self.tokens.match(TokenType.SPACE):
-                t = self.tokens.next()
-                children.append(Text(t.value))
-            else:
-                children.append(Text(self.tokens.next().value))
-        # consume closing **
-        if self.tokens.match(TokenType.DOUBLE_STAR):
-            self.tokens.next()
-        return Bold(children=children)
+        return self._parse_emphasis(_DOUBLE_STAR)
 
     # -------------------------------------------------------
     # parse italic: *...* or _..._
     # -------------------------------------------------------
     def parse_italic(self) -> Italic:
         # opening token may be STAR or UNDERSCORE
-        opener = self.tokens.next()
-        children: List = []
-        while not self.tokens.eof() and not self.tokens.match(opener.type) and not self.tokens.match(TokenType.NEWLINE):
-            if self.tokens.match(TokenType.DOUBLE_STAR):
-                children.append(self.parse_bold())
-            elif self.tokens.match(TokenType.BACKTICK):
-                children.append(self.parse_codespan())
-            elif self.tokens.match(TokenType.LBRACKET):
-                children.append(self.parse_link())
-            elif self.tokens.match(TokenType.TEXT) or self.tokens.match(TokenType.SPACE):
-                t = self.tokens.next()
-                children.append(Text(t.value))
-            else:
-                children.append(Text(self.tokens.next().value))
-        # closing token
-        if self.tokens.match(opener.type):
-            self.tokens.next()
-        return Italic(children=children)
+        opener_type = self.tokens.next().type
+        return self._parse_emphasis(opener_type)
 
     # -------------------------------------------------------
     # parse codespan `inline`
@@ -463,54 +797,57 @@ class Parser:
         # determine number of backticks delimiting the span (lexer returns one token per backtick)
         # count consecutive BACKTICK tokens
         count = 0
-        while self.tokens.match(TokenType.BACKTICK):
-            self.tokens.next()
+        while self.tokens.peek().type is _BACKTICK:
+            self.tokens.pos += 1
             count += 1
-        # collect tokens until we see same number of backticks again
-        parts: List[str] = []
-        while not self.tokens.eof():
-            # check next sequence for closing
-            if self._peek_backtick_sequence(count):
-                # consume closing sequence
-                for _ in range(count):
-                    self.tokens.next()
+        # scan до закривального прогону: один dict-пробінг на прогін із
+        # _bt_run_at, коротші прогони перестрибуються цілком (pos += run)
+        # замість поелементної перевірки count токенів на кожному кроці
+        toks = self.tokens.tokens
+        n = self.tokens.n
+        runs = self._bt_run_at
+        start = self.tokens.pos
+        pos = start
+        closed = False
+        while pos < n:
+            tt = toks[pos].type
+            if tt is _EOF:
                 break
-            t = self.tokens.next()
-            parts.append(t.value)
-        return CodeSpan(code=''.join(parts).strip())
-
-    def _peek_backtick_sequence(self, count: int) -> bool:
-        pos = self.tokens.pos
-        for i in range(count):
-            if pos + i >= len(self.tokens.tokens) or self.tokens.tokens[pos + i].type != TokenType.BACKTICK:
-                return False
-        return True
+            if tt is _BACKTICK:
+                run = runs.get(pos)
+                if run is None:
+                    # середина прогону (після часткового споживання
+                    # довшого закриття) — хвіст дораховуємо вручну
+                    run = 1
+                    while pos + run < n and toks[pos + run].type is _BACKTICK:
+                        run += 1
+                if run >= count:
+                    closed = True
+                    break
+                pos += run
+            else:
+                pos += 1
+        src = self._src
+        if src is not None and pos > start:
+            first = toks[start]
+            last = toks[pos - 1]
+            code = src[_tok_start(first):_tok_start(last) + len(last.value)]
+        else:
+            code = ''.join(map(_val, toks[start:pos]))
+        # вміст плюс рівно count закривальних бектіків
+        self.tokens.pos = pos + count if closed else pos
+        return CodeSpan(code=code.strip())
 
     # -------------------------------------------------------
     # parse link: [text](url) or reference-like; we support inline links
     # -------------------------------------------------------
     def parse_link(self) -> Link | Text:
-        if not self.tokens.match(TokenType.LBRACKET):
+        if not self.tokens.consume(TokenType.LBRACKET):
             return None  # або Text(''), якщо хочеш пропустити
-        self.tokens.next()  # споживаємо LBRACKET
-
-        text_nodes: list = []
-
-        while not self.tokens.eof() and not self.tokens.match(TokenType.RBRACKET):
-            if self.tokens.match(TokenType.DOUBLE_STAR):
-                text_nodes.append(self.parse_bold())
-            elif self.tokens.match(TokenType.STAR) or self.tokens.match(TokenType.UNDERSCORE):
-                text_nodes.append(self.parse_italic())
-            elif self.tokens.match(TokenType.BACKTICK):
-                text_nodes.append(self.parse_codespan())
-            elif self.tokens.match(TokenType.TEXT) or self.tokens.match(TokenType.SPACE):
-                t = self.tokens.next()
-                text_nodes.append(Text(t.value))
-            else:
-                text_nodes.append(Text(self.tokens.next().value))
 
-        if self.tokens.match(TokenType.RBRACKET):
-            self.tokens.next()  # споживаємо RBRACKET
+        text_nodes = self._parse_inline_group(_LINK_STOPS, self._link_dispatch)
+
+        if self.tokens.consume(TokenType.RBRACKET):
             # тут можна додати обробку URL, якщо парсер підтримує [text](url)
             return Link(text_nodes, '')  # порожній URL, якщо нема
         else:
@@ -549,6 +886,6 @@ from mdparser.markdown_parser.lexer import Lexer
 
 def parse_markdown(text: str) -> Document:
     tokens = Lexer(text).tokenize()
-    parser = Parser(tokens)
+    parser = Parser(tokens, text)
     return parser.parse()
 
@@ -1,19 +1,62 @@
 from __future__ import annotations
 from typing import List, Optional, Any
-import html as html_module
+import functools
+import io
 import json
+import re
 from mdparser.markdown_parser.ast_nodes import (
     Document, Paragraph, Heading, Text, Bold, Italic, Link,
     ListBlock, ListItem, CodeBlock, CodeSpan, BlockQuote, HorizontalRule,
-    Visitor, Node
+    Visitor, Node, visit
 )
 
 
 # -----------------------------------------------------------
 # Helper: safe escape for HTML content
 # -----------------------------------------------------------
+
+# html.escape робить до п'яти послідовних .replace — кожен зі своїм
+# проходом і проміжним рядком. str.translate проходить вхід один раз на
+# C-рівні. Замінники ті самі, що в html.escape(quote=True), тож вивід
+# байт-у-байт ідентичний (зокрема &#x27; у golden-знімках).
+_ESCAPE = str.maketrans({
+    "&": "&amp;",
+    "<": "&lt;",
+    ">": "&gt;",
+    '"': "&quot;",
+    "'": "&#x27;",
+})
+
+# Більшість Text-вузлів не містить жодного спецсимвола: дешевий
+# regex-пошук (один C-виклик) дозволяє віддати той самий рядок без
+# копії замість безумовного translate-аллоку на кожен вузол.
+_NEEDS_ESCAPE_RE = re.compile(r'[&<>"\']')
+
+
+# Короткі рядки (href-и, мови код-блоків, типові фрагменти) повторюються
+# в межах документа багато разів — обмежений LRU віддає готовий результат
+# без повторного translate. Межа розміру і поріг довжини тримають кеш
+# малим: довгі рядки рахуються навпрост і в кеш не потрапляють.
+_ESCAPE_CACHE_MAX_LEN = 128
+
+
+@functools.lru_cache(maxsize=1024)
+def _escape_cached(s: str) -> str:
+    return s.translate(_ESCAPE)
+
+
 def escape_html(s: str) -> str:
-    return html_module.escape(s, quote=True)
+    if _NEEDS_ESCAPE_RE.search(s) is None:
+        return s
+    if len(s) < _ESCAPE_CACHE_MAX_LEN:
+        return _escape_cached(s)
+    return s.translate(_ESCAPE)
+
+
+# Рівень заголовка затиснуто в 1..6 — всі можливі теги відомі наперед,
+# тож f-string на кожен заголовок зайвий (індекс 0 не використовується).
+_H_OPEN = ("", "<h1>", "<h2>", "<h3>", "<h4>", "<h5>", "<h6>")
+_H_CLOSE = ("", "</h1>", "</h2>", "</h3>", "</h4>", "</h5>", "</h6>")
 
 
 # -----------------------------------------------------------
@@ -22,7 +65,7 @@ def escape_html(s: str) -> str:
 class BaseRenderer(Visitor):
     def render(self, node: Node) -> str:
         """Dispatch entrypoint"""
-        node.accept(self)
+        visit(node, self)
         return self.get_output()
 
     def get_output(self) -> str:
@@ -36,25 +79,33 @@ class HTMLRenderer(BaseRenderer):
     def __init__(self, pretty: bool = True, indent_size: int = 2):
         self.pretty = pretty
         self.indent_size = indent_size
-        self._parts: List[str] = []
+        # Один C-буфер, що росте амортизовано, замість списку тисяч
+        # дрібних фрагментів із фінальним join-проходом по всіх.
+        self._buf = io.StringIO()
         self._level = 0
+        # Кеш префіксів відступу за рівнем: без множення рядка і
+        # конкатенації на кожен _w_indent при глибокій вкладеності.
+        self._indents = [""]
 
     def _w(self, s: str):
-        self._parts.append(s)
+        self._buf.write(s)
 
     def _w_indent(self, s: str):
-        if self.pretty:
-            self._parts.append(" " * (self.indent_size * self._level) + s)
-        else:
-            self._parts.append(s)
+        # _level == 0 — порожній префікс, нема чого писати
+        if self.pretty and self._level:
+            indents = self._indents
+            while len(indents) <= self._level:
+                indents.append(" " * (self.indent_size * len(indents)))
+            self._buf.write(indents[self._level])
+        self._buf.write(s)
 
     def get_output(self) -> str:
-        return ''.join(self._parts)
+        return self._buf.getvalue()
 
     # Document
     def visit_document(self, node: Document):
         for i, b in enumerate(node.blocks):
-            b.accept(self)
+            visit(b, self)
             # extra newline between blocks for readability
             if self.pretty and i != len(node.blocks) - 1:
                 self._w("\n")
@@ -63,7 +114,7 @@ class HTMLRenderer(BaseRenderer):
     def visit_paragraph(self, node: Paragraph):
         self._w_indent("<p>")
         for child in node.inlines:
-            child.accept(self)
+            visit(child, self)
         self._w("</p>")
         if self.pretty:
             self._w("\n")
@@ -71,10 +122,10 @@ class HTMLRenderer(BaseRenderer):
     # Heading
     def visit_heading(self, node: Heading):
         level = max(1, min(6, node.level))
-        self._w_indent(f"<h{level}>")
+        self._w_indent(_H_OPEN[level])
         for c in node.inlines:
-            c.accept(self)
-        self._w(f"</h{level}>")
+            visit(c, self)
+        self._w(_H_CLOSE[level])
         if self.pretty:
             self._w("\n")
 
@@ -86,14 +137,14 @@ class HTMLRenderer(BaseRenderer):
     def visit_bold(self, node: Bold):
         self._w("<strong>")
         for c in node.children:
-            c.accept(self)
+            visit(c, self)
         self._w("</strong>")
 
     # Italic
     def visit_italic(self, node: Italic):
         self._w("<em>")
         for c in node.children:
-            c.accept(self)
+            visit(c, self)
         self._w("</em>")
 
     # Link
@@ -101,20 +152,36 @@ class HTMLRenderer(BaseRenderer):
         href = escape_html(node.url or "")
         self._w(f'<a href="{href}">')
         for t in node.text_nodes:
-            t.accept(self)
+            visit(t, self)
         self._w("</a>")
 
     # List
     def visit_list(self, node: ListBlock):
-        tag = "ol" if node.ordered else "ul"
-        self._w_indent(f"<{tag}>")
+        # сталі теги замість f-string на кожен список
+        if node.ordered:
+            open_tag, close_tag = "<ol>", "</ol>"
+        else:
+            open_tag, close_tag = "<ul>", "</ul>"
+        self._w_indent(open_tag)
         if self.pretty:
             self._w("\n")
         self._level += 1
         for item in node.items:
-            item.accept(self)
+            children = item.children
+            # Типовий пункт — один Paragraph: рендеримо його inline-вміст
+            # прямо тут, без двох стрибків visit→visit_list_item на кожен
+            # елемент. Рідкісні багатоблочні пункти йдуть загальним шляхом.
+            if len(children) == 1 and type(children[0]) is Paragraph:
+                self._w_indent("<li>")
+                for inl in children[0].inlines:
+                    visit(inl, self)
+                self._w("</li>")
+                if self.pretty:
+                    self._w("\n")
+            else:
+                visit(item, self)
         self._level -= 1
-        self._w_indent(f"</{tag}>")
+        self._w_indent(close_tag)
         if self.pretty:
             self._w("\n")
 
@@ -127,12 +194,12 @@ class HTMLRenderer(BaseRenderer):
             # If paragraph — render inline content only to avoid double <p> inside <li>
             if isinstance(c, Paragraph):
                 for inl in c.inlines:
-                    inl.accept(self)
+                    visit(inl, self)
             else:
                 # nested block — new line + indentation
                 if not first and self.pretty:
                     self._w("\n")
-                c.accept(self)
+                visit(c, self)
             first = False
         self._w("</li>")
         if self.pretty:
@@ -163,7 +230,7 @@ class HTMLRenderer(BaseRenderer):
             self._w("\n")
         self._level += 1
         for c in node.children:
-            c.accept(self)
+            visit(c, self)
         self._level -= 1
         self._w_indent("</blockquote>")
         if self.pretty:
@@ -181,42 +248,42 @@ class HTMLRenderer(BaseRenderer):
 # -----------------------------------------------------------
 class PlainTextRenderer(BaseRenderer):
     def __init__(self):
-        self._parts: List[str] = []
+        self._buf = io.StringIO()
 
     def get_output(self) -> str:
-        return ''.join(self._parts)
+        return self._buf.getvalue()
 
     def visit_document(self, node: Document):
         for b in node.blocks:
-            b.accept(self)
-            self._parts.append("\n")
+            visit(b, self)
+            self._buf.write("\n")
 
     def visit_paragraph(self, node: Paragraph):
         for inline in node.inlines:
-            inline.accept(self)
-        self._parts.append("\n\n")
+            visit(inline, self)
+        self._buf.write("\n\n")
 
     def visit_heading(self, node: Heading):
         hashes = "#" * node.level
-        self._parts.append(hashes + " ")
+        self._buf.write(hashes + " ")
         for inline in node.inlines:
-            inline.accept(self)
-        self._parts.append("\n\n")
+            visit(inline, self)
+        self._buf.write("\n\n")
 
     def visit_text(self, node: Text):
-        self._parts.append(node.text)
+        self._buf.write(node.text)
 
     def visit_bold(self, node: Bold):
-        self._parts.append("**")
+        self._buf.write("**")
         for c in node.children:
-            c.accept(self)
-        self._parts.append("**")
+            visit(c, self)
+        self._buf.write("**")
 
     def visit_italic(self, node: Italic):
-        self._parts.append("*")
+        self._buf.write("*")
         for c in node.children:
-            c.accept(self)
-        self._parts.append("*")
+            visit(c, self)
+        self._buf.write("*")
 
     def visit_link(self, node: Link):
         text = []
@@ -224,9 +291,9 @@ class PlainTextRenderer(BaseRenderer):
             if isinstance(i, Text):
                 text.append(i.text)
             else:
-                i.accept(self)
+                visit(i, self)
         text_str = ''.join(text)
-        self._parts.append(f"[{text_str}]({node.url})")
+        self._buf.write(f"[{text_str}]({node.url})")
 
     def visit_list(self, node: ListBlock):
         for i, it in enumerate(node.items, start=1):
@@ -234,84 +301,132 @@ class PlainTextRenderer(BaseRenderer):
                 prefix = f"{i}. "
             else:
                 prefix = "- "
-            self._parts.append(prefix)
+            self._buf.write(prefix)
 
             # items usually contain a Paragraph
             if it.children:
                 first = it.children[0]
                 if isinstance(first, Paragraph):
                     for inl in first.inlines:
-                        inl.accept(self)
+                        visit(inl, self)
                 else:
-                    first.accept(self)
+                    visit(first, self)
 
-            self._parts.append("\n")
+            self._buf.write("\n")
 
     def visit_list_item(self, node: ListItem):
         pass  # handled in visit_list
 
     def visit_codeblock(self, node: CodeBlock):
         lang = node.language or ""
-        self._parts.append("```" + lang + "\n")
-        self._parts.append(node.code)
-        self._parts.append("\n```\n")
+        self._buf.write("```" + lang + "\n")
+        self._buf.write(node.code)
+        self._buf.write("\n```\n")
 
     def visit_codespan(self, node: CodeSpan):
-        self._parts.append("`")
-        self._parts.append(node.code)
-        self._parts.append("`")
+        self._buf.write("`")
+        self._buf.write(node.code)
+        self._buf.write("`")
 
     def visit_blockquote(self, node: BlockQuote):
         for c in node.children:
-            self._parts.append("> ")
+            self._buf.write("> ")
             if isinstance(c, Paragraph):
                 for inl in c.inlines:
-                    inl.accept(self)
+                    visit(inl, self)
             else:
-                c.accept(self)
-            self._parts.append("\n")
+                visit(c, self)
+            self._buf.write("\n")
 
     def visit_hr(self, node: HorizontalRule):
-        self._parts.append("---\n")
+        self._buf.write("---\n")
 
     def _render_inlines(self, inlines: List[Any]) -> List[str]:
+        # Диспетч за типом через таблицю (O(1) dict-пробінг) замість
+        # каскаду isinstance на кожен вузол.
         collector: List[str] = []
+        handlers = _INLINE_FLATTEN
         for i in inlines:
-            if isinstance(i, Text):
-                collector.append(i.text)
-            elif isinstance(i, Bold):
-                # flatten bold
-                for c in i.children:
-                    if isinstance(c, Text):
-                        collector.append(c.text)
-                    else:
-                        collector.append(str(c))
-            elif isinstance(i, Italic):
-                for c in i.children:
-                    if isinstance(c, Text):
-                        collector.append(c.text)
-                    else:
-                        collector.append(str(c))
-            elif isinstance(i, Link):
-                collector.append(''.join(self._render_inlines(i.text_nodes)))
+            handler = handlers.get(type(i))
+            if handler is not None:
+                handler(self, i, collector)
             else:
                 collector.append(str(i))
         return collector
 
 
+# Таблиця type -> обробник для PlainTextRenderer._render_inlines
+# (той самий прийом, що _VISITOR_METHOD у ast_nodes).
+def _flatten_text(renderer, node, collector):
+    collector.append(node.text)
+
+
+def _flatten_children(renderer, node, collector):
+    # flatten bold/italic
+    for c in node.children:
+        if type(c) is Text:
+            collector.append(c.text)
+        else:
+            collector.append(str(c))
+
+
+def _flatten_link(renderer, node, collector):
+    collector.append(''.join(renderer._render_inlines(node.text_nodes)))
+
+
+_INLINE_FLATTEN = {
+    Text: _flatten_text,
+    Bold: _flatten_children,
+    Italic: _flatten_children,
+    Link: _flatten_link,
+}
+
+
 # -----------------------------------------------------------
 # JSON Renderer (for golden master snapshots)
 # -----------------------------------------------------------
+# Пласкі серіалізатори для json.dumps(default=...): кожен віддає dict
+# лише поточного вузла, діти лишаються Node-об'єктами — їх json.dumps
+# сам передасть у default під час обходу. Так не матеріалізується
+# проміжне дерево dict'ів на повний AST (to_dict будує його цілком,
+# а dumps потім обходить удруге). Порядок ключів збігається з to_dict.
+_JSON_SHALLOW = {
+    Text: lambda n: {"type": "Text", "text": n.text},
+    CodeSpan: lambda n: {"type": "CodeSpan", "code": n.code},
+    Bold: lambda n: {"type": "Bold", "children": n.children},
+    Italic: lambda n: {"type": "Italic", "children": n.children},
+    Link: lambda n: {"type": "Link", "text_nodes": n.text_nodes,
+                     "url": n.url, "title": n.title},
+    Paragraph: lambda n: {"type": "Paragraph", "inlines": n.inlines},
+    Heading: lambda n: {"type": "Heading", "level": n.level, "inlines": n.inlines},
+    CodeBlock: lambda n: {"type": "CodeBlock", "code": n.code, "language": n.language},
+    BlockQuote: lambda n: {"type": "BlockQuote", "children": n.children},
+    ListItem: lambda n: {"type": "ListItem", "children": n.children},
+    ListBlock: lambda n: {"type": "ListBlock", "ordered": n.ordered, "items": n.items},
+    HorizontalRule: lambda n: {"type": "HorizontalRule"},
+    Document: lambda n: {"type": "Document", "blocks": n.blocks},
+}
+
+
+def _json_default(o):
+    fn = _JSON_SHALLOW.get(type(o))
+    if fn is not None:
+        return fn(o)
+    # Невідомий (кастомний) вузол — серіалізуємо повним to_dict, як раніше.
+    return o.to_dict()
+
+
 class JSONRenderer(BaseRenderer):
     def __init__(self, indent: Optional[int] = 2):
         self.indent = indent
-        self._json = None
+        self._doc: Optional[Document] = None
 
     def get_output(self) -> str:
-        return json.dumps(self._json, ensure_ascii=False, indent=self.indent)
+        return json.dumps(self._doc, default=_json_default,
+                          ensure_ascii=False, indent=self.indent)
 
     def visit_document(self, node: Document):
-        self._json = node.to_dict()
+        self._doc = node
 
 
 # -----------------------------------------------------------
@@ -326,6 +441,28 @@ def render_text(doc: Document) -> str:
     r = PlainTextRenderer()
     return r.render(doc)
 
+def render_html_from_text(text: str, pretty: bool = True) -> str:
+    """Markdown → HTML без утримання повного AST у пам'яті.
+
+    Парсер віддає блоки по одному (iter_blocks), і кожен рендериться
+    одразу у спільний буфер — живим лишається один блок замість цілого
+    Document, що помітно зменшує пікові алокації на великих документах.
+    Вивід байт-у-байт той самий, що render_html(parse(text)).
+    """
+    # Локальний імпорт: renderer — нижній шар, не тягнемо parser при
+    # звичайному використанні з готовим AST.
+    from mdparser.markdown_parser.lexer import Lexer
+    from mdparser.markdown_parser.parser import Parser
+    r = HTMLRenderer(pretty=pretty)
+    first = True
+    for block in Parser(Lexer(text).tokenize(), text).iter_blocks():
+        # Той самий роздільник між блоками, що у visit_document
+        if pretty and not first:
+            r._w("\n")
+        visit(block, r)
+        first = False
+    return r.get_output()
+
 def render_json(doc: Document, indent: Optional[int] = 2) -> str:
     r = JSONRenderer(indent=indent)
     return r.render(doc)
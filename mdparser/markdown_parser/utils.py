@@ -2,5 +2,17 @@
 import hashlib
 from typing import Any
 
-def hash_text(text: str) -> str:
-    return hashlib.sha256(text.encode('utf-8')).hexdigest()
\ No newline at end of file
+# Хеш тут — лише ключ кешу в межах процесу, криптостійкість не потрібна.
+# xxh3 у рази швидший за SHA-256; без встановленого xxhash падаємо на
+# stdlib BLAKE2b (16 байт), який теж помітно швидший за SHA-256.
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+if xxhash is not None:
+    def hash_text(text: str) -> str:
+        return xxhash.xxh3_64(text.encode('utf-8')).hexdigest()
+else:
+    def hash_text(text: str) -> str:
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
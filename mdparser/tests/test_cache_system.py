@@ -13,11 +13,13 @@ from mdparser.markdown_parser.cache import (
 # -----------------------------------------------------------
 
 def test_make_key():
+    # Перевіряємо контракт ключа, а не конкретний алгоритм: так заміна
+    # хеша не вимагає правок тесту.
     key = make_key("hello")
-    assert key == hashlib.sha256(b"hello").hexdigest()
-    assert len(key) == 64
+    assert isinstance(key, bytes)
     assert make_key("hello") == make_key("hello")
     assert make_key("hello") != make_key("world")
+    assert len(make_key("hello")) == len(make_key("a much longer input string"))
 
 
 # -----------------------------------------------------------
@@ -189,6 +191,23 @@ def test_cache_manager_disabled():
     assert cm.get_html("x") is None
 
 
+def test_cache_manager_get_or_compute_ast():
+    cm = CacheManager(LRUCache(10))
+    calls = []
+
+    def parse(text):
+        calls.append(text)
+        return {"parsed": text}
+
+    # Перший виклик — miss, parse викликається; другий — hit без parse
+    assert cm.get_or_compute_ast("hello", parse) == {"parsed": "hello"}
+    assert cm.get_or_compute_ast("hello", parse) == {"parsed": "hello"}
+    assert calls == ["hello"]
+
+    # Ключі сумісні зі старим шляхом get_ast/set_ast
+    assert cm.get_ast("hello") == {"parsed": "hello"}
+
+
 def test_cache_manager_clear():
     cm = CacheManager(LRUCache(10))
     cm.set_tokens("hello", [1])
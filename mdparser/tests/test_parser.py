@@ -10,7 +10,7 @@ from mdparser.markdown_parser.ast_nodes import (
     Link, ListBlock, ListItem, CodeBlock, CodeSpan,
     BlockQuote, HorizontalRule,
     mk_text, mk_bold, mk_italic, mk_link, mk_paragraph, mk_heading, mk_codeblock, mk_list,
-    _node_from_dict
+    _node_from_dict, node_to_dict
 )
 
 # ----------------------------------------------------------
@@ -57,13 +57,15 @@ def test_parse_paragraph_single():
     doc = parse_markdown("Hello world")
     p = doc.blocks[0]
     assert isinstance(p, Paragraph)
-    assert [t.text for t in p.inlines] == ["Hello", " ", "world"]
+    # суцільний текст без форматування — один об'єднаний Text-вузол
+    assert [t.text for t in p.inlines] == ["Hello world"]
 
 def test_parse_paragraph_soft_break():
     doc = parse_markdown("Hello\nworld")
     p = doc.blocks[0]
     assert isinstance(p, Paragraph)
-    assert [t.text for t in p.inlines] == ["Hello", " ", "world"]
+    # м'який перенос — пробіл у спільному текстовому буфері, один вузол
+    assert [t.text for t in p.inlines] == ["Hello world"]
 
 # ----------------------------------------------------------
 # Lists
@@ -134,13 +136,15 @@ def test_parse_paragraph_single():
     doc = parse_markdown("Hello world")
     p = doc.blocks[0]
     assert isinstance(p, Paragraph)
-    assert [t.text for t in p.inlines] == ["Hello", " ", "world"]
+    # суцільний текст без форматування — один об'єднаний Text-вузол
+    assert [t.text for t in p.inlines] == ["Hello world"]
 
 def test_parse_paragraph_soft_break():
     doc = parse_markdown("Hello\nworld")
     p = doc.blocks[0]
     assert isinstance(p, Paragraph)
-    assert [t.text for t in p.inlines] == ["Hello", " ", "world"]
+    # м'який перенос — пробіл у спільному текстовому буфері, один вузол
+    assert [t.text for t in p.inlines] == ["Hello world"]
 
 def test_parse_codespan():
     doc = parse_markdown("`code`")
@@ -226,8 +230,8 @@ def test_parse_inline_until_mix():
     doc = parse_markdown("Hello **bold** `code` *i*")
     p = doc.blocks[0]
     types = [type(n).__name__ for n in p.inlines]
-    assert types == ["Text", "Text", "Bold", "Text", "CodeSpan", "Text", "Italic"]
-    assert [n.text if isinstance(n, Text) else None for n in p.inlines] == ["Hello", " ", None, " ", None, " ", None]
+    assert types == ["Text", "Bold", "Text", "CodeSpan", "Text", "Italic"]
+    assert [n.text if isinstance(n, Text) else None for n in p.inlines] == ["Hello ", None, " ", None, " ", None]
 
 def test_parse_link_with_formatting():
     doc = parse_markdown("[**b** _i_](x)")
@@ -290,6 +294,30 @@ def test_listblock_to_from_dict():
     assert len(lst2.items) == 2
     assert lst2.items[0].children[0].inlines[0].text == "a"
 
+def test_node_to_dict_matches_recursive():
+    doc = Document(blocks=[
+        Heading(1, [Text("h"), Bold([Text("b")])]),
+        Paragraph([Link([Text("txt")], url="u", title="t"), CodeSpan("c")]),
+        ListBlock([ListItem([Paragraph([Text("a")])])], ordered=True),
+        BlockQuote([Paragraph([Italic([Text("i")])])]),
+        CodeBlock("code", language="py"),
+        HorizontalRule(),
+    ])
+    assert node_to_dict(doc) == doc.to_dict()
+
+
+def test_node_to_dict_deep_nesting_no_recursion_limit():
+    # Рекурсивний to_dict на такій глибині падає з RecursionError
+    node = Paragraph([Text("x")])
+    for _ in range(5000):
+        node = BlockQuote([node])
+    d = node_to_dict(node)
+    for _ in range(5000):
+        assert d["type"] == "BlockQuote"
+        d = d["children"][0]
+    assert d["type"] == "Paragraph"
+
+
 def test_mk_helpers():
     t = mk_text("x")
     b = mk_bold(t)
@@ -7,7 +7,7 @@ def test_start_snapshot_sets_attributes():
     monitor = PerformanceMonitor()
     with patch("tracemalloc.start") as mock_tracemalloc_start, \
          patch("psutil.Process") as mock_process:
-        monitor.start_snapshot()
+        monitor.start_snapshot(deep=True)
         mock_tracemalloc_start.assert_called_once()
         mock_process.assert_called_once()
         # Перевіримо, що обʼєкт процесу збережено
@@ -15,6 +15,17 @@ def test_start_snapshot_sets_attributes():
         # Перевіримо, що _t0 збережено
         assert hasattr(monitor, "_t0")
 
+def test_fast_snapshot_skips_tracemalloc():
+    monitor = PerformanceMonitor()
+    with patch("tracemalloc.start") as mock_tracemalloc_start:
+        monitor.start_snapshot()  # швидкий режим за замовчуванням
+        rec = monitor.stop_snapshot()
+    mock_tracemalloc_start.assert_not_called()
+    assert rec['duration'] >= 0
+    assert 'cpu_time' in rec
+    assert 'max_rss' in rec
+    assert monitor.records[-1] == rec
+
 def test_stop_snapshot_returns_dict():
     monitor = PerformanceMonitor()
     mock_proc = MagicMock()
@@ -22,6 +33,7 @@ def test_stop_snapshot_returns_dict():
     mock_proc.memory_info.return_value.rss = 123456
     monitor._proc = mock_proc
     monitor._t0 = 0
+    monitor._deep = True
 
     with patch("time.time", return_value=1.0), \
          patch("tracemalloc.get_traced_memory", return_value=(111, 222)), \
@@ -248,19 +248,18 @@ def test_plaintext_hr():
 # JSON RENDERER
 # ===========================================================
 
-def test_json_renderer_basic(monkeypatch):
-    # Fake to_dict for controlled output
-    monkeypatch.setattr(Document, "to_dict", lambda self: {"a": 1})
+def test_json_renderer_basic():
+    # JSONRenderer тепер серіалізує вузли напряму через default=,
+    # без проміжного to_dict-дерева, тож перевіряємо реальний вивід.
     doc = Document(blocks=[])
     out = render_json(doc)
-    assert out.strip() == '{\n  "a": 1\n}'
+    assert out.strip() == '{\n  "type": "Document",\n  "blocks": []\n}'
 
 
-def test_json_indent_none(monkeypatch):
-    monkeypatch.setattr(Document, "to_dict", lambda self: {"x": 2})
+def test_json_indent_none():
     doc = Document(blocks=[])
     out = render_json(doc, indent=None)
-    assert out == '{"x": 2}'
+    assert out == '{"type": "Document", "blocks": []}'
 
 def test_html_list_item_nested_block():
     doc = Document(blocks=[
@@ -289,8 +288,18 @@ def test_plaintext_renderer_render_inlines_complex():
     out = r._render_inlines(inlines)
     assert ''.join(out) == "ABIL"
 
-def test_json_renderer_no_indent(monkeypatch):
-    monkeypatch.setattr(Document, "to_dict", lambda self: {"key": "val"})
-    doc = Document(blocks=[])
+def test_json_renderer_no_indent():
+    doc = Document(blocks=[Paragraph(inlines=[T("hi")])])
     out = render_json(doc, indent=None)
-    assert out == '{"key": "val"}'
\ No newline at end of file
+    # Вивід має збігатися з повним to_dict-деревом
+    import json as _json
+    assert out == _json.dumps(doc.to_dict(), ensure_ascii=False)
+def test_render_html_from_text_matches_two_pass():
+    from mdparser.markdown_parser.lexer import Lexer
+    from mdparser.markdown_parser.parser import Parser
+    from mdparser.markdown_parser.renderer import render_html_from_text
+    text = "# Title\n\nPara with **bold** and [l](u).\n\n- one\n- two\n\n> quote\n"
+    doc = Parser(Lexer(text).tokenize(), text).parse()
+    # Потоковий шлях має давати байт-у-байт той самий HTML
+    assert render_html_from_text(text) == render_html(doc, pretty=True)
+    assert render_html_from_text(text, pretty=False) == render_html(doc, pretty=False)
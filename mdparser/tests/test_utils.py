@@ -1,10 +1,16 @@
 # tests/test_utils.py
 import hashlib
+from mdparser.markdown_parser import utils
 from mdparser.markdown_parser.utils import hash_text
 
-def test_hash_text_returns_sha256():
+def test_hash_text_matches_backend():
+    # hash_text тепер xxh3 (якщо встановлено xxhash) або BLAKE2b-128;
+    # перевіряємо проти фактично активного бекенда.
     text = "hello world"
-    expected = hashlib.sha256(text.encode('utf-8')).hexdigest()
+    if utils.xxhash is not None:
+        expected = utils.xxhash.xxh3_64(text.encode('utf-8')).hexdigest()
+    else:
+        expected = hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
     assert hash_text(text) == expected
 
 def test_hash_text_consistency():
@@ -17,4 +23,5 @@ def test_hash_text_length():
     text = "any text"
     result = hash_text(text)
     assert isinstance(result, str)
-    assert len(result) == 64
\ No newline at end of file
+    # xxh3_64 → 16 hex-символів, BLAKE2b-128 → 32
+    assert len(result) == (16 if utils.xxhash is not None else 32)